@@ -213,7 +213,7 @@ class AddToKnowledgeBaseTool(Tool):
                         print(f"🔧 First chunk preview: {chunks[0].content[:100]}...")
                     else:
                         print(f"🔧 No chunks - checking original content...")
-                        original_content = result.get("original_content", "")
+                        original_content = content
                         print(f"🔧 Original content length: {len(original_content)}")
                         if original_content:
                             print(
@@ -266,22 +266,9 @@ class AddToKnowledgeBaseTool(Tool):
 
                     if success and self.document_manager:
                         # Update document manager statistics
-                        self.document_manager.processed_documents.append(
-                            {
-                                "filename": title,
-                                "path": f"tool:{source}",
-                                "chunks": len(chunks),
-                                "processed_at": datetime.now().isoformat(),
-                            }
-                        )
-
-                        self.document_manager.document_stats["total_documents"] += 1
-                        self.document_manager.document_stats["total_chunks"] += len(
-                            chunks
+                        self.document_manager.record_document(
+                            title, f"tool:{source}", len(chunks)
                         )
-                        self.document_manager.document_stats[
-                            "last_updated"
-                        ] = datetime.now().isoformat()
 
                         print(
                             f"✅ Updated DocumentManager stats: {len(chunks)} chunks added"
@@ -999,7 +986,7 @@ class Agent:
         )
 
         # Always try RAG retrieval first to get relevant documents from knowledge base
-        rag_result = self.rag_chain.process_query(
+        rag_result = await self.rag_chain.process_query(
             user_input,
             conversation_id=self.conversation_id,
             template_name="rag_qa",
@@ -1038,7 +1025,9 @@ Please provide a comprehensive response that combines insights from both the kno
             ]
 
             try:
-                llm_response = self.rag_chain.llm_manager.generate_response(messages)
+                llm_response = await self.rag_chain.llm_manager.agenerate_response(
+                    messages
+                )
                 return {
                     "response": llm_response.content,
                     "tools_used": tools_used,
@@ -1069,7 +1058,7 @@ Please provide a comprehensive response that combines insights from both the kno
     async def _generate_simple_response(self, user_input: str) -> Dict[str, Any]:
         """Generate simple response without tools but still use RAG."""
         # Always try RAG first to get relevant documents from knowledge base
-        rag_result = self.rag_chain.process_query(
+        rag_result = await self.rag_chain.process_query(
             user_input,
             conversation_id=self.conversation_id,
             template_name="rag_qa",
@@ -1094,7 +1083,9 @@ Please provide a comprehensive response that combines insights from both the kno
                     {"role": "user", "content": user_input},
                 ]
 
-                llm_response = self.rag_chain.llm_manager.generate_response(messages)
+                llm_response = await self.rag_chain.llm_manager.agenerate_response(
+                    messages
+                )
 
                 return {
                     "response": llm_response.content,
@@ -1126,6 +1117,32 @@ Please provide a comprehensive response that combines insights from both the kno
             ],
         }
 
+    async def record_turn(self, user_input: str, response: str) -> None:
+        """Record an exchange answered outside process_request, e.g. from a cache."""
+        self.memory.add_to_short_term(
+            {
+                "type": "user_input",
+                "content": user_input,
+                "conversation_id": self.conversation_id,
+            }
+        )
+        self.memory.add_to_short_term(
+            {
+                "type": "agent_response",
+                "content": response,
+                "conversation_id": self.conversation_id,
+                "tools_used": [],
+            }
+        )
+        await self.rag_chain.arecord_turn(self.conversation_id, user_input, response)
+
+    async def aclose(self) -> None:
+        """Close HTTP sessions held by the LLM client and the tools."""
+        await self.rag_chain.llm_manager.aclose()
+        for tool in self.tool_manager.tools.values():
+            if hasattr(tool, "aclose"):
+                await tool.aclose()
+
     def clear_memory(self) -> None:
         """Clear agent memory."""
         self.memory = AgentMemory()
@@ -1241,7 +1258,7 @@ Research Materials:
 
 Please synthesize the information and provide a well-structured response."""
 
-            rag_result = self.agent.rag_chain.process_query(
+            rag_result = await self.agent.rag_chain.process_query(
                 research_query,
                 conversation_id=self.agent.conversation_id,
                 template_name="rag_qa",
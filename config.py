@@ -42,6 +42,13 @@ class LLMConfig(BaseModel):
     max_tokens: int = Field(
         default=1000, gt=0, description="Maximum tokens in response"
     )
+    max_concurrency: int = Field(
+        default=8, gt=0, description="Maximum concurrent LLM requests per batch"
+    )
+    use_responses_api: bool = Field(
+        default=False,
+        description="Keep conversation state server-side via the Responses API",
+    )
 
     # LangChain Configuration
     langchain_tracing: bool = Field(
@@ -52,6 +59,17 @@ class LLMConfig(BaseModel):
     )
     langchain_api_key: str = Field(..., description="LangChain API key")
 
+    # Semantic Response Cache
+    semantic_cache_size: int = Field(
+        default=256, ge=0, description="Cached RAG responses (0 disables the cache)"
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.92, ge=0.0, le=1.0, description="Cosine similarity for a cache hit"
+    )
+    semantic_cache_ttl: int = Field(
+        default=3600, gt=0, description="Seconds a cached response stays valid"
+    )
+
     @field_validator("temperature")
     def validate_temperature(cls, v):
         """Validate temperature is within acceptable range."""
@@ -72,7 +90,7 @@ class VectorStoreConfig(BaseModel):
 
     # Vector Store Settings
     vector_store_type: str = Field(
-        default="chroma", description="Type of vector store (chroma, faiss)"
+        default="chroma", description="Type of vector store (chroma, faiss, memory)"
     )
     collection_name: str = Field(
         default="code_agent_docs", description="Collection name in vector store"
@@ -80,17 +98,77 @@ class VectorStoreConfig(BaseModel):
     persist_directory: str = Field(
         default="./vector_store", description="Directory to persist vector store"
     )
+    faiss_index_type: str = Field(
+        default="hnsw", description="FAISS index type (flat, hnsw, ivfpq)"
+    )
+    faiss_quantization: str = Field(
+        default="none", description="FAISS vector quantization (none/fp32, fp16, int8)"
+    )
+    faiss_hnsw_m: int = Field(default=32, gt=0, description="HNSW graph degree")
+    faiss_ef_construction: int = Field(
+        default=200, gt=0, description="HNSW candidate list size when building"
+    )
+    faiss_ef_search: int = Field(
+        default=64, gt=0, description="HNSW candidate list size when searching"
+    )
+    faiss_nprobe: int = Field(
+        default=16, gt=0, description="IVF inverted lists scanned per search"
+    )
+    faiss_pq_m: int = Field(
+        default=32, gt=0, description="PQ sub-quantizers (bytes per vector)"
+    )
+    faiss_threads: int = Field(
+        default=0, ge=0, description="FAISS OpenMP search threads (0 = CPU count)"
+    )
+    faiss_mmap: bool = Field(
+        default=False,
+        description="Memory-map saved FAISS indexes instead of reading them in",
+    )
 
     # Embedding Settings
+    embedding_provider: str = Field(
+        default="openai", description="Embedding provider (openai, ollama, local)"
+    )
     embedding_model: str = Field(
         default="text-embedding-ada-002", description="Embedding model name"
     )
+    ollama_base_url: str = Field(
+        default="http://localhost:11434", description="Ollama server for embeddings"
+    )
+    embedding_dimensions: int = Field(
+        default=0,
+        ge=0,
+        description="Truncate text-embedding-3 vectors to this size (0 = full)",
+    )
+    embedding_cache_path: str = Field(
+        default="~/.cache/rag/embeddings.sqlite",
+        description="SQLite file caching chunk embeddings (empty disables)",
+    )
+    query_embedding_cache_size: int = Field(
+        default=4096, ge=0, description="Query embeddings kept in memory (LRU)"
+    )
+    embedding_batch_size: int = Field(
+        default=500, gt=0, description="Texts per embedding API request"
+    )
+    embedding_max_concurrency: int = Field(
+        default=4, gt=0, description="Embedding API requests in flight at once"
+    )
     chunk_size: int = Field(
         default=1000, gt=0, description="Text chunk size for processing"
     )
     chunk_overlap: int = Field(
         default=200, ge=0, description="Overlap between text chunks"
     )
+    use_rust_splitter: bool = Field(
+        default=False,
+        description="Use the Rust text-splitter for recursive chunking",
+    )
+    ingest_max_workers: int = Field(
+        default=0, ge=0, description="Processes parsing a directory (0 = CPU count)"
+    )
+    ingest_batch_size: int = Field(
+        default=100, gt=0, description="Chunks embedded per vector store write"
+    )
 
     # Search Settings
     search_k: int = Field(
@@ -127,6 +205,18 @@ class AgentConfig(BaseModel):
     memory_max_tokens: int = Field(
         default=2000, gt=0, description="Maximum tokens in memory"
     )
+    max_conversations: int = Field(
+        default=10000, gt=0, description="Conversations kept in process memory"
+    )
+    max_history: int = Field(
+        default=1000, gt=0, description="CLI conversation history entries kept"
+    )
+    conversation_redis_url: Optional[str] = Field(
+        default=None, description="Redis URL for persisting conversations"
+    )
+    conversation_ttl: int = Field(
+        default=86400, gt=0, description="Seconds a stored conversation is kept"
+    )
 
     # Tool Settings
     enable_code_execution: bool = Field(
@@ -216,24 +306,58 @@ def load_config() -> ProjectConfig:
         model_name=os.getenv("MODEL_NAME", "gpt-3.5-turbo"),
         temperature=float(os.getenv("TEMPERATURE", "0.1")),
         max_tokens=int(os.getenv("MAX_TOKENS", "1000")),
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+        use_responses_api=os.getenv("USE_RESPONSES_API", "false").lower() == "true",
         langchain_tracing=os.getenv("LANGCHAIN_TRACING_V2", "true").lower() == "true",
         langchain_endpoint=os.getenv(
             "LANGCHAIN_ENDPOINT", "https://api.smith.langchain.com"
         ),
+        semantic_cache_size=int(os.getenv("SEMANTIC_CACHE_SIZE", "256")),
+        semantic_cache_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+        semantic_cache_ttl=int(os.getenv("SEMANTIC_CACHE_TTL", "3600")),
     )
 
     vector_store_config = VectorStoreConfig(
         vector_store_type=os.getenv("VECTOR_STORE_TYPE", "chroma"),
         collection_name=os.getenv("COLLECTION_NAME", "code_agent_docs"),
         persist_directory=os.getenv("PERSIST_DIRECTORY", "./vector_store"),
+        embedding_provider=os.getenv("EMBEDDING_PROVIDER", "openai"),
+        embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002"),
+        ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+        embedding_dimensions=int(os.getenv("EMBEDDING_DIMENSIONS", "0")),
+        embedding_cache_path=os.getenv(
+            "EMBEDDING_CACHE_PATH", "~/.cache/rag/embeddings.sqlite"
+        ),
+        query_embedding_cache_size=int(
+            os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096")
+        ),
+        embedding_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "500")),
+        embedding_max_concurrency=int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4")),
+        faiss_index_type=os.getenv("FAISS_INDEX_TYPE", "hnsw"),
+        faiss_quantization=os.getenv("FAISS_QUANTIZATION", "none"),
+        faiss_hnsw_m=int(os.getenv("FAISS_HNSW_M", "32")),
+        faiss_ef_construction=int(os.getenv("FAISS_EF_CONSTRUCTION", "200")),
+        faiss_ef_search=int(os.getenv("FAISS_EF_SEARCH", "64")),
+        faiss_nprobe=int(os.getenv("FAISS_NPROBE", "16")),
+        faiss_pq_m=int(os.getenv("FAISS_PQ_M", "32")),
+        faiss_threads=int(os.getenv("FAISS_THREADS", "0")),
+        faiss_mmap=os.getenv("FAISS_MMAP", "false").lower() == "true",
         chunk_size=int(os.getenv("CHUNK_SIZE", "1000")),
         chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "200")),
+        use_rust_splitter=os.getenv("USE_RUST_SPLITTER", "false").lower() == "true",
+        ingest_max_workers=int(os.getenv("INGEST_MAX_WORKERS", "0")),
+        ingest_batch_size=int(os.getenv("INGEST_BATCH_SIZE", "100")),
     )
 
     agent_config = AgentConfig(
         agent_name=os.getenv("AGENT_NAME", "CodeAgent"),
         max_iterations=int(os.getenv("MAX_ITERATIONS", "10")),
         max_execution_time=int(os.getenv("MAX_EXECUTION_TIME", "60")),
+        memory_max_tokens=int(os.getenv("MEMORY_MAX_TOKENS", "2000")),
+        max_conversations=int(os.getenv("MAX_CONVERSATIONS", "10000")),
+        max_history=int(os.getenv("MAX_HISTORY", "1000")),
+        conversation_redis_url=os.getenv("CONVERSATION_REDIS_URL"),
+        conversation_ttl=int(os.getenv("CONVERSATION_TTL", "86400")),
         enable_code_execution=os.getenv("ENABLE_CODE_EXECUTION", "false").lower()
         == "true",
         enable_file_operations=os.getenv("ENABLE_FILE_OPERATIONS", "true").lower()
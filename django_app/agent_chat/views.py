@@ -11,7 +11,7 @@ import uuid
 
 from .models import Conversation, Message, AgentSession
 from .serializers import ConversationSerializer, MessageSerializer, AgentSessionSerializer
-from knowledge_base.services import AgentService, KnowledgeBaseService
+from knowledge_base.services import get_agent_service
 
 
 @api_view(['POST'])
@@ -58,7 +58,7 @@ def send_message(request, conversation_id):
     
     try:
         # Process with agent
-        agent_service = AgentService()
+        agent_service = get_agent_service()
         
         # Convert to async context
         loop = asyncio.new_event_loop()
@@ -74,6 +74,8 @@ def send_message(request, conversation_id):
                 )
             )
         finally:
+            # Clients pooled on this loop can't be reused once it closes
+            loop.run_until_complete(agent_service.aclose())
             loop.close()
         
         if result['success']:
@@ -165,7 +167,7 @@ def delete_conversation(request, conversation_id):
 def get_agent_tools(request):
     """Get available agent tools."""
     try:
-        agent_service = AgentService()
+        agent_service = get_agent_service()
         tools = agent_service.get_available_tools()
         workflows = agent_service.get_available_workflows()
         
@@ -182,7 +184,7 @@ def get_agent_tools(request):
 def get_agent_status(request):
     """Get agent status and statistics."""
     try:
-        agent_service = AgentService()
+        agent_service = get_agent_service()
         status_info = agent_service.get_agent_status()
         
         return Response(status_info)
@@ -162,4 +162,6 @@ AGENT_CONFIG = {
     'MAX_MEMORY_USAGE': 512,  # MB
     'ENABLE_CODE_EXECUTION': True,
     'ENABLE_GITHUB_INTEGRATION': True,
+    'RAG_CACHE_THRESHOLD': 0.95,  # Cosine similarity for semantic cache hits
+    'RAG_CACHE_TIMEOUT': 3600,  # Seconds
 }
@@ -1,11 +1,18 @@
 """
 Knowledge Base Services - Django integration for RAG functionality.
 """
+import atexit
 import os
+import re
 import sys
 import tempfile
+import threading
+import uuid
 from typing import Dict, List, Any, Optional
+from asgiref.sync import async_to_sync
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 
 # Add the parent directory to sys.path to import the original modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -14,34 +21,196 @@ try:
     from config import get_config
     from llm_integration import create_llm_manager, create_rag_chain
     from vector_store import create_vector_store, create_retriever
+    from document_processor import create_document_processor
     from agent_core import create_agent, AgentWorkflow
     LLM_INTEGRATION_AVAILABLE = True
 except ImportError as e:
     print(f"LLM Integration not available: {e}")
     LLM_INTEGRATION_AVAILABLE = False
 
+try:
+    import faiss
+    import numpy as np
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
 from .models import Document, DocumentChunk, VectorStoreIndex
 
+# Phrases indicating the RAG answer was too generic to be useful
+GENERIC_RESPONSE_PATTERN = re.compile(
+    r'without any relevant documents'
+    r'|do not have enough information'
+    r'|no relevant documents found'
+    r'|i am unable to'
+    r'|cannot provide',
+    re.IGNORECASE
+)
+
+
+class SemanticCache:
+    """Cache RAG responses keyed by query embedding similarity.
+
+    Normalized query embeddings live in an in-process FAISS inner-product
+    index; the cached payloads are stored in Django's cache backend along
+    with the corpus version they were answered against, so indexing new
+    documents retires every earlier answer in all workers.
+    """
+    
+    # Nearest cached queries checked per lookup, so an expired neighbour
+    # does not hide a live one behind it
+    SEARCH_K = 8
+    
+    def __init__(self, threshold: float = 0.95, timeout: int = 3600,
+                 max_entries: int = 100000, key_prefix: str = 'rag_semantic'):
+        self.threshold = threshold
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.key_prefix = key_prefix
+        self.version_key = f"{key_prefix}:corpus_version"
+        self.index = None
+        self.keys: List[str] = []
+        self._index_version = None
+        self._lock = threading.Lock()
+    
+    def _as_query_vector(self, embedding: List[float]):
+        vector = np.asarray([embedding], dtype=np.float32)
+        faiss.normalize_L2(vector)
+        return vector
+    
+    def corpus_version(self) -> int:
+        """Return the shared corpus version cached answers must match."""
+        return cache.get_or_set(self.version_key, 0, None)
+    
+    def invalidate(self) -> None:
+        """Retire all cached answers, e.g. after new documents are indexed."""
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, None)
+    
+    def _reset_if_stale(self, version: int) -> None:
+        """Drop the local index once it holds answers for an older corpus."""
+        if self._index_version != version:
+            self.index = None
+            self.keys = []
+            self._index_version = version
+    
+    def lookup(self, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """Return the cached payload of the closest query above the threshold."""
+        if not FAISS_AVAILABLE or self.index is None:
+            return None
+        
+        version = self.corpus_version()
+        vector = self._as_query_vector(embedding)
+        with self._lock:
+            self._reset_if_stale(version)
+            if self.index is None or self.index.ntotal == 0:
+                return None
+            
+            k = min(self.SEARCH_K, self.index.ntotal)
+            scores, indices = self.index.search(vector, k)
+            expired = []
+            payload = None
+            for score, position in zip(scores[0], indices[0]):
+                if position < 0 or score < self.threshold:
+                    break
+                entry = cache.get(self.keys[position])
+                if entry is None or entry.get('corpus_version') != version:
+                    expired.append(int(position))
+                    continue
+                payload = entry['payload']
+                break
+            
+            if expired:
+                # Flat indexes compact on removal, keeping keys aligned
+                self.index.remove_ids(np.asarray(expired, dtype=np.int64))
+                for position in sorted(expired, reverse=True):
+                    del self.keys[position]
+        
+        return payload
+    
+    def store(self, embedding: List[float], payload: Dict[str, Any]) -> None:
+        """Store a payload for the given query embedding."""
+        if not FAISS_AVAILABLE:
+            return
+        
+        version = self.corpus_version()
+        vector = self._as_query_vector(embedding)
+        key = f"{self.key_prefix}:{uuid.uuid4().hex}"
+        cache.set(key, {'corpus_version': version, 'payload': payload}, self.timeout)
+        
+        with self._lock:
+            self._reset_if_stale(version)
+            if self.index is None or self.index.ntotal >= self.max_entries:
+                # Start over rather than growing without bound
+                self.index = faiss.IndexFlatIP(vector.shape[1])
+                self.keys = []
+            self.index.add(vector)
+            self.keys.append(key)
+
+
+rag_semantic_cache = SemanticCache(
+    threshold=settings.AGENT_CONFIG.get('RAG_CACHE_THRESHOLD', 0.95),
+    timeout=settings.AGENT_CONFIG.get('RAG_CACHE_TIMEOUT', 3600),
+)
+
 
 class KnowledgeBaseService:
     """Service to manage knowledge base operations."""
     
     def __init__(self):
-        # Temporarily simplified until dependencies are resolved
-        pass
-        # self.config = get_config()
-        # self.document_processor = DocumentProcessor(self.config)
-        # self.vector_store = create_vector_store(self.config)
-        # self.retriever = create_retriever(self.vector_store, self.config)
-        # self.llm_manager = create_llm_manager(self.config)
-        # self.rag_chain = create_rag_chain(self.retriever, self.config)
+        self.available = False
+        
+        if LLM_INTEGRATION_AVAILABLE:
+            try:
+                self.config = get_config()
+                self.document_processor = create_document_processor(self.config)
+                self.vector_store = create_vector_store(self.config)
+                self.retriever = create_retriever(self.vector_store, self.config)
+                self.rag_chain = create_rag_chain(self.retriever, self.config)
+                # Saves are throttled during indexing; flush the rest on exit
+                atexit.register(self.vector_store.save)
+                self.available = True
+            except Exception as e:
+                print(f"Failed to initialize knowledge base: {e}")
+    
+    def _unavailable(self) -> Dict[str, Any]:
+        """Error result returned when the RAG components failed to load."""
+        return {
+            'success': False,
+            'error': 'Knowledge base is not available',
+            'results': [],
+            'response': ''
+        }
         
     def add_document(self, title: str, content: str, source_type: str = 'user_input', 
                     user=None, metadata: Dict = None) -> Dict[str, Any]:
         """Add a document to the knowledge base."""
+        if not self.available:
+            return self._unavailable()
+        
         try:
-            # Create Django Document record
-            document = Document.objects.create(
+            # Process content into chunks before touching the database
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+                f.write(content)
+                temp_path = f.name
+            
+            try:
+                result = self.document_processor.process_document(temp_path)
+                chunks = result.get('chunks', [])
+            finally:
+                os.unlink(temp_path)
+            
+            if not chunks:
+                return {
+                    'success': False,
+                    'error': 'No content could be extracted'
+                }
+            
+            # The primary key is generated client-side, so chunk metadata can
+            # reference the document before it is saved
+            document = Document(
                 title=title,
                 content=content,
                 source_type=source_type,
@@ -50,60 +219,68 @@ class KnowledgeBaseService:
                 language=self._detect_language(content)
             )
             
-            # Process content into chunks
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-                f.write(content)
-                temp_path = f.name
+            chunk_records = []
+            for i, chunk in enumerate(chunks):
+                chunk.source_document = title
+                chunk.metadata.update({
+                    'document_id': str(document.id),
+                    'source_type': source_type,
+                    'chunk_index': i
+                })
+                chunk_records.append(DocumentChunk(
+                    document=document,
+                    content=chunk.content,
+                    chunk_index=i,
+                    metadata=chunk.metadata,
+                    start_char=chunk.metadata.get('start_char'),
+                    end_char=chunk.metadata.get('end_char')
+                ))
             
-            try:
-                result = self.document_processor.process_document(temp_path)
-                chunks = result.get('chunks', [])
-                
-                if chunks:
-                    # Update chunk metadata and add to vector store
-                    for i, chunk in enumerate(chunks):
-                        chunk.source_document = title
-                        chunk.metadata.update({
-                            'document_id': str(document.id),
-                            'source_type': source_type,
-                            'chunk_index': i
-                        })
-                        
-                        # Create Django DocumentChunk record
-                        DocumentChunk.objects.create(
-                            document=document,
-                            content=chunk.content,
-                            chunk_index=i,
-                            metadata=chunk.metadata,
-                            start_char=chunk.metadata.get('start_char'),
-                            end_char=chunk.metadata.get('end_char')
-                        )
-                    
-                    # Add to vector store
+            vector_store_result = {}
+            
+            def add_to_vector_store():
+                # Runs only once the document and its chunks are committed
+                try:
                     success = self.vector_store.add_documents(chunks)
-                    
-                    if success:
-                        return {
-                            'success': True,
-                            'document_id': str(document.id),
-                            'chunks_added': len(chunks),
-                            'title': title
-                        }
-                    else:
-                        document.delete()  # Clean up if vector store failed
-                        return {
-                            'success': False,
-                            'error': 'Failed to add to vector store'
-                        }
+                except Exception as e:
+                    print(f"Warning: Could not index document {document.id}: {e}")
+                    success = False
+                vector_store_result['success'] = success
+                if success:
+                    # Answers cached before this document cannot cite it
+                    rag_semantic_cache.invalidate()
                 else:
-                    document.delete()
-                    return {
-                        'success': False,
-                        'error': 'No content could be extracted'
-                    }
-                    
-            finally:
-                os.unlink(temp_path)
+                    document.delete()  # Clean up if vector store failed
+            
+            with transaction.atomic():
+                document.save(force_insert=True)
+                DocumentChunk.objects.bulk_create(chunk_records)
+                transaction.on_commit(add_to_vector_store)
+            
+            if 'success' not in vector_store_result:
+                # Inside an outer transaction (e.g. ATOMIC_REQUESTS) indexing
+                # waits for the outermost commit, after this returns; a
+                # failure then removes the document again
+                return {
+                    'success': True,
+                    'document_id': str(document.id),
+                    'chunks_added': len(chunks),
+                    'title': title,
+                    'indexing': 'pending'
+                }
+            
+            if not vector_store_result['success']:
+                return {
+                    'success': False,
+                    'error': 'Failed to add to vector store'
+                }
+            
+            return {
+                'success': True,
+                'document_id': str(document.id),
+                'chunks_added': len(chunks),
+                'title': title
+            }
                 
         except Exception as e:
             return {
@@ -111,10 +288,14 @@ class KnowledgeBaseService:
                 'error': str(e)
             }
     
-    def search_documents(self, query: str, k: int = 5, user=None) -> Dict[str, Any]:
+    def search_documents(self, query: str, k: int = 5, user=None,
+                         recall_hint: str = None) -> Dict[str, Any]:
         """Search documents in the knowledge base."""
+        if not self.available:
+            return self._unavailable()
+        
         try:
-            results = self.retriever.retrieve_documents(query, k=k)
+            results = self.retriever.retrieve_documents(query, k=k, recall_hint=recall_hint)
             
             search_results = []
             for result in results:
@@ -153,14 +334,25 @@ class KnowledgeBaseService:
     
     def get_rag_response(self, query: str, conversation_id: str = None) -> Dict[str, Any]:
         """Get a RAG-powered response to a query."""
+        if not self.available:
+            return self._unavailable()
+        
         try:
-            result = self.rag_chain.process_query(
-                query,
-                conversation_id=conversation_id,
-                template_name="rag_qa",
-                retrieval_k=5
-            )
-            return result
+            # Only stateless queries are served from the semantic cache
+            query_embedding = None
+            if conversation_id is None and FAISS_AVAILABLE:
+                embedding_manager = self.rag_chain.retriever.vector_store.embedding_manager
+                query_embedding = embedding_manager.generate_embedding(query).embedding
+                cached = rag_semantic_cache.lookup(query_embedding)
+                if cached is not None:
+                    return {**cached, 'cache_hit': True}
+            
+            result = async_to_sync(self._process_query)(query, conversation_id)
+            
+            if query_embedding is not None and result.get('success'):
+                rag_semantic_cache.store(query_embedding, result)
+            
+            return {**result, 'cache_hit': False}
         except Exception as e:
             return {
                 'success': False,
@@ -168,6 +360,20 @@ class KnowledgeBaseService:
                 'response': ''
             }
     
+    async def _process_query(self, query: str, conversation_id: str = None) -> Dict[str, Any]:
+        """Run the RAG chain, closing the LLM clients opened on this loop."""
+        try:
+            return await self.rag_chain.process_query(
+                query,
+                conversation_id=conversation_id,
+                template_name="rag_qa",
+                retrieval_k=5,
+                use_semantic_cache=False
+            )
+        finally:
+            # async_to_sync runs each call on its own loop
+            await self.rag_chain.llm_manager.aclose()
+    
     def _detect_language(self, content: str) -> str:
         """Detect programming language from content."""
         content_lower = content.lower()
@@ -203,12 +409,18 @@ class AgentService:
                 self.config = get_config()
                 self.llm_manager = create_llm_manager(self.config)
                 
-                # Initialize vector store and retriever
-                self.vector_store = create_vector_store(self.config)
-                self.retriever = create_retriever(self.vector_store, self.config)
-                
-                # Create RAG chain
-                self.rag_chain = create_rag_chain(self.retriever, self.config)
+                # Share the knowledge base's index so documents added there
+                # are searchable here and one store owns the index files
+                if self.knowledge_service.available:
+                    self.vector_store = self.knowledge_service.vector_store
+                    self.retriever = self.knowledge_service.retriever
+                    self.rag_chain = self.knowledge_service.rag_chain
+                else:
+                    self.vector_store = create_vector_store(self.config)
+                    self.retriever = create_retriever(self.vector_store, self.config)
+                    # Saves are throttled during indexing; flush the rest on exit
+                    atexit.register(self.vector_store.save)
+                    self.rag_chain = create_rag_chain(self.retriever, self.config)
                 
                 # Create agent with tools
                 self.agent = create_agent(self.rag_chain, self.config)
@@ -233,6 +445,12 @@ class AgentService:
         ]
         self.workflows = ['code_assistant', 'debug_helper', 'github_explorer']
     
+    async def aclose(self):
+        """Close the async clients opened on the running event loop."""
+        if self.llm_available:
+            await self.llm_manager.aclose()
+            await self.agent.aclose()
+    
     async def process_message(self, message: str, conversation_id: str = None, 
                             use_tools: bool = True, workflow: str = None) -> Dict[str, Any]:
         """Process a user message with the agent."""
@@ -251,7 +469,7 @@ class AgentService:
             # Try the full RAG system first
             if hasattr(self, 'rag_chain'):
                 try:
-                    result = self.rag_chain.process_query(
+                    result = await self.rag_chain.process_query(
                         message,
                         conversation_id=conversation_id,
                         template_name="chat",
@@ -259,14 +477,7 @@ class AgentService:
                     )
                     
                     # Check if the response is too generic/unhelpful
-                    response_text = result.get('response', '').lower()
-                    if any(phrase in response_text for phrase in [
-                        'without any relevant documents',
-                        'do not have enough information',
-                        'no relevant documents found',
-                        'i am unable to',
-                        'cannot provide'
-                    ]):
+                    if GENERIC_RESPONSE_PATTERN.search(result.get('response', '')):
                         # Fall back to direct LLM for general programming help
                         result = await self._direct_llm_response(message, conversation_id)
                     
@@ -324,7 +535,7 @@ Provide clear, practical, and helpful responses. Include code examples when rele
                 }
             ]
             
-            llm_response = self.llm_manager.generate_response(messages)
+            llm_response = await self.llm_manager.agenerate_response(messages)
             
             return {
                 'response': llm_response.content,
@@ -387,4 +598,31 @@ Provide clear, practical, and helpful responses. Include code examples when rele
             'tools_count': len(self.available_tools),
             'workflows_count': len(self.workflows),
             'message': 'Agent is ready (simplified mode)'
-        }
\ No newline at end of file
+        }
+
+
+# Shared service instances - created on first use and reused per worker process
+_knowledge_base_service = None
+_agent_service = None
+_service_lock = threading.Lock()
+
+
+def get_knowledge_base_service() -> KnowledgeBaseService:
+    """Get the shared KnowledgeBaseService instance, creating it if needed."""
+    global _knowledge_base_service
+    if _knowledge_base_service is None:
+        with _service_lock:
+            if _knowledge_base_service is None:
+                _knowledge_base_service = KnowledgeBaseService()
+    return _knowledge_base_service
+
+
+def get_agent_service() -> AgentService:
+    """Get the shared AgentService instance, creating it if needed."""
+    global _agent_service
+    if _agent_service is None:
+        knowledge_service = get_knowledge_base_service()
+        with _service_lock:
+            if _agent_service is None:
+                _agent_service = AgentService(knowledge_service)
+    return _agent_service
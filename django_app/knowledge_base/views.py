@@ -5,25 +5,45 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import UploadedFile
+import mmap
 import tempfile
 import os
 
+try:
+    import charset_normalizer
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+try:
+    import chardet
+    CHARDET_AVAILABLE = True
+except ImportError:
+    CHARDET_AVAILABLE = False
+
 from .models import Document, DocumentChunk, VectorStoreIndex
 from .serializers import DocumentSerializer, DocumentChunkSerializer, VectorStoreIndexSerializer
-from .services import KnowledgeBaseService
+from .services import get_knowledge_base_service
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_documents(request):
     """List user's documents in knowledge base."""
-    documents = Document.objects.filter(uploaded_by=request.user, is_active=True).order_by('-created_at')
-    serializer = DocumentSerializer(documents, many=True)
-    return Response(serializer.data)
+    # Plain dicts with an annotated chunk count avoid per-row model and
+    # serializer instances plus one COUNT query per document
+    documents = (
+        Document.objects.filter(uploaded_by=request.user, is_active=True)
+        .annotate(chunk_count=Count('chunks'))
+        .order_by('-created_at')
+        .values(*DocumentSerializer.Meta.fields)
+    )
+    return Response(list(documents))
 
 
 @api_view(['POST'])
@@ -37,7 +57,7 @@ def upload_document(request):
     if not title or not content:
         return Response({'error': 'Title and content are required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    knowledge_service = KnowledgeBaseService()
+    knowledge_service = get_knowledge_base_service()
     result = knowledge_service.add_document(
         title=title,
         content=content,
@@ -76,7 +96,7 @@ def upload_file(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Add to knowledge base
-        knowledge_service = KnowledgeBaseService()
+        knowledge_service = get_knowledge_base_service()
         result = knowledge_service.add_document(
             title=uploaded_file.name,
             content=content,
@@ -118,16 +138,8 @@ def extract_content_from_file(uploaded_file: UploadedFile, file_extension: str)
         temp_file_path = temp_file.name
     
     try:
-        if file_extension == '.txt':
-            return extract_text_content(temp_file_path)
-        elif file_extension == '.pdf':
-            return extract_pdf_content(temp_file_path)
-        elif file_extension in ['.png', '.jpg', '.jpeg']:
-            return extract_image_content(temp_file_path)
-        elif file_extension == '.docx':
-            return extract_docx_content(temp_file_path)
-        else:
-            return ""
+        extractor = CONTENT_EXTRACTORS.get(file_extension)
+        return extractor(temp_file_path) if extractor else ""
     finally:
         if os.path.exists(temp_file_path):
             os.unlink(temp_file_path)
@@ -135,23 +147,53 @@ def extract_content_from_file(uploaded_file: UploadedFile, file_extension: str)
 
 def extract_text_content(file_path: str) -> str:
     """Extract content from text files."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    except UnicodeDecodeError:
-        # Try with different encoding
-        with open(file_path, 'r', encoding='latin-1') as file:
-            return file.read()
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ''
+        
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            try:
+                return str(buffer, 'utf-8')
+            except UnicodeDecodeError:
+                pass
+            
+            # Only detect the encoding once strict UTF-8 has failed
+            if CHARSET_NORMALIZER_AVAILABLE:
+                match = charset_normalizer.from_bytes(bytes(buffer)).best()
+                if match is not None:
+                    return str(match)
+            
+            if CHARDET_AVAILABLE:
+                encoding = chardet.detect(buffer[:65536])['encoding']
+                # An ASCII sample of a file that isn't valid UTF-8 means the
+                # bad bytes are further in, so treat it as damaged UTF-8
+                if encoding and encoding.lower() == 'ascii':
+                    encoding = 'utf-8'
+                if encoding:
+                    return str(buffer, encoding, 'replace')
+            
+            # Fall back without re-reading the file
+            return str(buffer, 'latin-1')
+
 
+def missing_dependency_message(file_kind: str, package: str) -> str:
+    """Placeholder content returned when an optional extractor is not installed."""
+    return (f"{file_kind} content extraction requires the {package} package. "
+            "Please install it or use text files for now.")
 
+
+# Heavy extraction libraries are imported on first use to keep startup cheap
 def extract_pdf_content(file_path: str) -> str:
     """Extract content from PDF files."""
     try:
-        # Simple text extraction without PyPDF2 dependency for now
-        content = []
-        with open(file_path, 'rb') as file:
-            # For now, just return a placeholder until PyPDF2 is added
-            return "PDF content extraction requires PyPDF2 library. Please install it or use text files for now."
+        from pypdf import PdfReader
+    except ImportError:
+        return missing_dependency_message('PDF', 'pypdf')
+    
+    try:
+        reader = PdfReader(file_path, strict=False)
+        page_texts = (page.extract_text() or '' for page in reader.pages)
+        return "\n\n".join(text for text in page_texts if text.strip())
     except Exception as e:
         raise Exception(f"Error reading PDF: {str(e)}")
 
@@ -159,8 +201,14 @@ def extract_pdf_content(file_path: str) -> str:
 def extract_image_content(file_path: str) -> str:
     """Extract text from images using OCR."""
     try:
-        # Simple image text placeholder until OCR libraries are installed
-        return "Image text extraction requires PIL and pytesseract libraries. Please install them or use text files for now."
+        import pytesseract
+        from PIL import Image
+    except ImportError:
+        return missing_dependency_message('Image text', 'pytesseract and Pillow')
+    
+    try:
+        with Image.open(file_path) as image:
+            return pytesseract.image_to_string(image)
     except Exception as e:
         raise Exception(f"Error extracting text from image: {str(e)}")
 
@@ -168,12 +216,27 @@ def extract_image_content(file_path: str) -> str:
 def extract_docx_content(file_path: str) -> str:
     """Extract content from DOCX files."""
     try:
-        # Simple DOCX extraction placeholder until python-docx is installed
-        return "DOCX content extraction requires python-docx library. Please install it or use text files for now."
+        from docx import Document as DocxDocument
+    except ImportError:
+        return missing_dependency_message('DOCX', 'python-docx')
+    
+    try:
+        paragraphs = DocxDocument(file_path).paragraphs
+        return "\n\n".join(p.text for p in paragraphs if p.text.strip())
     except Exception as e:
         raise Exception(f"Error reading DOCX: {str(e)}")
 
 
+CONTENT_EXTRACTORS = {
+    '.txt': extract_text_content,
+    '.pdf': extract_pdf_content,
+    '.png': extract_image_content,
+    '.jpg': extract_image_content,
+    '.jpeg': extract_image_content,
+    '.docx': extract_docx_content,
+}
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_document_detail(request, document_id):
@@ -205,12 +268,15 @@ def search_documents(request):
     """Search documents in knowledge base."""
     query = request.data.get('query', '')
     k = request.data.get('k', 5)
+    recall_hint = request.data.get('recall_hint')
     
     if not query:
         return Response({'error': 'Query is required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    knowledge_service = KnowledgeBaseService()
-    result = knowledge_service.search_documents(query, k=k, user=request.user)
+    knowledge_service = get_knowledge_base_service()
+    result = knowledge_service.search_documents(
+        query, k=k, user=request.user, recall_hint=recall_hint
+    )
     
     return Response(result)
 
@@ -225,7 +291,7 @@ def rag_query(request):
     if not query:
         return Response({'error': 'Query is required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    knowledge_service = KnowledgeBaseService()
+    knowledge_service = get_knowledge_base_service()
     result = knowledge_service.get_rag_response(query, conversation_id)
     
     return Response(result)
@@ -16,16 +16,21 @@ Key Components:
 
 Technologies Used:
 - LangChain: For document loading and text splitting
-- pypdf: For PDF processing
+- PyMuPDF / pypdf: For PDF processing
 - python-docx: For Word document processing
 - Pydantic: For data validation and models
 """
 
+import io
 import os
+import copy
 import hashlib
+import mmap
+import zipfile
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
@@ -49,6 +54,17 @@ try:
 except ImportError:
     HAS_LANGCHAIN_LOADERS = False
 
+try:
+    import pymupdf
+
+    # Plain-text extraction never collects images or vector paths; also
+    # join words hyphenated across line breaks
+    PDF_TEXT_FLAGS = pymupdf.TEXTFLAGS_TEXT | pymupdf.TEXT_DEHYPHENATE
+
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
 try:
     import pypdf
 
@@ -56,6 +72,34 @@ try:
 except ImportError:
     HAS_PYPDF = False
 
+try:
+    import charset_normalizer
+
+    HAS_CHARSET_NORMALIZER = True
+except ImportError:
+    HAS_CHARSET_NORMALIZER = False
+
+try:
+    import tiktoken
+
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+try:
+    from semantic_text_splitter import TextSplitter as RustTextSplitter
+
+    HAS_RUST_SPLITTER = True
+except ImportError:
+    HAS_RUST_SPLITTER = False
+
+try:
+    from lxml import etree
+
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
 try:
     from docx import Document as DocxDocument
 
@@ -65,6 +109,19 @@ except ImportError:
 
 from config import get_config
 
+# Files larger than this are memory-mapped rather than read into a buffer
+MMAP_THRESHOLD = 1 << 20
+
+# PDFs with at least this many pages have their pages extracted in parallel
+PDF_PARALLEL_MIN_PAGES = 64
+
+# Maximum number of processed documents kept in DocumentProcessor's cache
+DOC_CACHE_MAX_ENTRIES = 256
+
+# Shortest repeated text treated as splitter overlap when merging chunks;
+# shorter matches are more likely coincidence than overlap
+MIN_MERGE_OVERLAP = 8
+
 
 class DocumentType(Enum):
     """Enumeration of supported document types."""
@@ -90,7 +147,21 @@ class ChunkingStrategy(Enum):
     PARAGRAPH = "paragraph"
 
 
-@dataclass
+# File extension to document type, shared by loaders and the processor
+EXTENSION_TO_TYPE = {
+    ".pdf": DocumentType.PDF,
+    ".docx": DocumentType.DOCX,
+    ".doc": DocumentType.DOC,
+    ".txt": DocumentType.TXT,
+    ".text": DocumentType.TXT,
+    ".md": DocumentType.MD,
+    ".html": DocumentType.HTML,
+    ".json": DocumentType.JSON,
+    ".csv": DocumentType.CSV,
+}
+
+
+@dataclass(slots=True, frozen=True)
 class DocumentMetadata:
     """
     Metadata container for processed documents.
@@ -189,12 +260,19 @@ class DocumentLoader(ABC):
         return file_path
 
     def _calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate MD5 hash of the file for change detection."""
-        hash_md5 = hashlib.md5()
+        """Calculate SHA-256 hash of the file for change detection."""
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return hashlib.sha256(mm).hexdigest()
+
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                return hashlib.file_digest(f, "sha256").hexdigest()
+
+            hash_sha256 = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hash_sha256.update(chunk)
+            return hash_sha256.hexdigest()
 
     @abstractmethod
     def load_content(self, file_path: Union[str, Path]) -> str:
@@ -206,25 +284,15 @@ class DocumentLoader(ABC):
         file_path = Path(file_path)
         extension = file_path.suffix.lower()
 
-        type_mapping = {
-            ".pdf": DocumentType.PDF,
-            ".docx": DocumentType.DOCX,
-            ".doc": DocumentType.DOC,
-            ".txt": DocumentType.TXT,
-            ".md": DocumentType.MD,
-            ".html": DocumentType.HTML,
-            ".json": DocumentType.JSON,
-            ".csv": DocumentType.CSV,
-        }
-
-        return type_mapping.get(extension, DocumentType.UNKNOWN)
+        return EXTENSION_TO_TYPE.get(extension, DocumentType.UNKNOWN)
 
 
 class TextLoader(DocumentLoader):
     """
     Loader for plain text files (.txt, .md).
 
-    This loader handles basic text files with various encodings.
+    This loader handles basic text files with various encodings, detected
+    with charset-normalizer when the file is not UTF-8.
     """
 
     def __init__(self):
@@ -235,29 +303,58 @@ class TextLoader(DocumentLoader):
         """Load content from a text file with encoding detection."""
         file_path = self._validate_file(file_path)
 
-        # Try different encodings
-        for encoding in self.encoding_attempts:
-            try:
-                with open(file_path, "r", encoding=encoding) as f:
-                    content = f.read()
-
-                # Validate that we got meaningful content
-                if content.strip():
-                    return content
+        # Read the bytes once and try each encoding against the same buffer;
+        # large files are memory-mapped (mmap rejects zero-byte files)
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    content = self._decode(mm)
+            else:
+                content = self._decode(f.read())
 
-            except (UnicodeDecodeError, UnicodeError):
-                continue
+        if content is not None:
+            return content
 
         raise ValueError(
             f"Could not decode file {file_path} with any supported encoding"
         )
 
+    def _decode(self, data) -> Optional[str]:
+        """Decode raw bytes, detecting the encoding when UTF-8 fails."""
+        content = None
+        try:
+            content = str(data, "utf-8")
+        except UnicodeDecodeError:
+            if HAS_CHARSET_NORMALIZER:
+                match = charset_normalizer.from_bytes(bytes(data)).best()
+                if match is not None:
+                    content = str(match)
+
+        # Without a detected encoding, fall back to the fixed list
+        if content is None:
+            for encoding in self.encoding_attempts:
+                try:
+                    content = str(data, encoding)
+                    break
+                except (UnicodeDecodeError, UnicodeError):
+                    continue
+
+        # Validate that we got meaningful content
+        if not content or not content.strip():
+            return None
+
+        # Match the newline translation of text-mode reads
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content
+
 
 class PDFLoader(DocumentLoader):
     """
     Loader for PDF files.
 
-    This loader extracts text from PDF files using pypdf or LangChain loaders.
+    This loader extracts text from PDF files using PyMuPDF, falling back to
+    LangChain loaders or pypdf.
     """
 
     def __init__(self):
@@ -267,7 +364,29 @@ class PDFLoader(DocumentLoader):
         """Load content from a PDF file."""
         file_path = self._validate_file(file_path)
 
-        # Try LangChain PyPDFLoader first (more robust)
+        # Read the file in one sequential pass; parsers then seek in memory
+        # instead of issuing many small reads against the filesystem
+        data = file_path.read_bytes()
+
+        # Try PyMuPDF first (native parser, much faster than pypdf)
+        if HAS_PYMUPDF:
+            try:
+                with pymupdf.open(stream=data, filetype="pdf") as doc:
+                    page_count = doc.page_count
+                    workers = self._get_page_workers(page_count)
+                    if workers <= 1:
+                        return "\n\n".join(
+                            page.get_text("text", flags=PDF_TEXT_FLAGS) for page in doc
+                        )
+
+                content_parts = self._extract_pages_parallel(
+                    file_path, page_count, workers
+                )
+                return "\n\n".join(content_parts)
+            except Exception as e:
+                print(f"Warning: PyMuPDF PDF loader failed: {e}")
+
+        # Try LangChain PyPDFLoader next
         if HAS_LANGCHAIN_LOADERS:
             try:
                 loader = PyPDFLoader(str(file_path))
@@ -282,19 +401,17 @@ class PDFLoader(DocumentLoader):
                 import pypdf
 
                 content_parts = []
-
-                with open(file_path, "rb") as file:
-                    pdf_reader = pypdf.PdfReader(file)
-
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        try:
-                            text = page.extract_text()
-                            if text.strip():
-                                content_parts.append(text)
-                        except Exception as e:
-                            print(
-                                f"Warning: Could not extract text from page {page_num}: {e}"
-                            )
+                pdf_reader = pypdf.PdfReader(io.BytesIO(data))
+
+                for page_num, page in enumerate(pdf_reader.pages):
+                    try:
+                        text = page.extract_text()
+                        if text.strip():
+                            content_parts.append(text)
+                    except Exception as e:
+                        print(
+                            f"Warning: Could not extract text from page {page_num}: {e}"
+                        )
 
                 if content_parts:
                     return "\n\n".join(content_parts)
@@ -304,16 +421,53 @@ class PDFLoader(DocumentLoader):
             except Exception as e:
                 raise ValueError(f"Failed to load PDF content: {e}")
 
-        raise ImportError("PDF loading requires pypdf or langchain-community packages")
+        raise ImportError(
+            "PDF loading requires pymupdf, pypdf or langchain-community packages"
+        )
+
+    @staticmethod
+    def _get_page_workers(page_count: int) -> int:
+        """Get the number of processes to extract a PDF's pages with."""
+        # Directory workers already keep every core busy
+        if page_count < PDF_PARALLEL_MIN_PAGES or _worker_processor is not None:
+            return 1
+        return min(os.cpu_count() or 1, page_count // 8)
+
+    @staticmethod
+    def _extract_pages_parallel(
+        file_path: Path, page_count: int, workers: int
+    ) -> List[str]:
+        """
+        Extract page text over contiguous page ranges in worker processes.
+
+        PyMuPDF is not thread-safe, so each process opens its own document.
+        """
+        block = max(8, -(-page_count // workers))
+        ranges = [
+            (start, min(start + block, page_count))
+            for start in range(0, page_count, block)
+        ]
+
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            parts = executor.map(
+                _extract_pdf_page_range,
+                [str(file_path)] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+            return [text for part in parts for text in part]
 
 
 class DOCXLoader(DocumentLoader):
     """
     Loader for Microsoft Word documents (.docx).
 
-    This loader extracts text from Word documents using python-docx or LangChain.
+    This loader streams paragraph text straight from the document XML with
+    lxml, falling back to LangChain or python-docx.
     """
 
+    WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
     def __init__(self):
         super().__init__([".docx", ".doc"])
 
@@ -321,7 +475,16 @@ class DOCXLoader(DocumentLoader):
         """Load content from a Word document."""
         file_path = self._validate_file(file_path)
 
-        # Try LangChain loader first
+        # Fast path: parse word/document.xml without building a python-docx DOM
+        if HAS_LXML and zipfile.is_zipfile(file_path):
+            try:
+                content = self._extract_xml_text(file_path)
+                if content:
+                    return content
+            except Exception as e:
+                print(f"Warning: DOCX XML extraction failed: {e}")
+
+        # Try LangChain loader next
         if HAS_LANGCHAIN_LOADERS:
             try:
                 loader = UnstructuredWordDocumentLoader(str(file_path))
@@ -350,9 +513,127 @@ class DOCXLoader(DocumentLoader):
                 raise ValueError(f"Failed to load DOCX content: {e}")
 
         raise ImportError(
-            "DOCX loading requires python-docx or langchain-community packages"
+            "DOCX loading requires lxml, python-docx or langchain-community packages"
         )
 
+    def _extract_xml_text(self, file_path: Path) -> str:
+        """Join the text runs of each paragraph in word/document.xml."""
+        paragraph_tag = f"{self.WORD_NAMESPACE}p"
+        text_tag = f"{self.WORD_NAMESPACE}t"
+
+        content_parts = []
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open("word/document.xml") as document_xml:
+                for _, paragraph in etree.iterparse(document_xml, tag=paragraph_tag):
+                    text = "".join(
+                        node.text for node in paragraph.iter(text_tag) if node.text
+                    ).strip()
+                    if text:
+                        content_parts.append(text)
+                    # Free parsed paragraphs to keep memory flat
+                    paragraph.clear()
+
+        return "\n\n".join(content_parts)
+
+
+def _merge_small(
+    chunks: Iterable[str], min_size: int, max_combined: int, max_overlap: int = 0
+) -> Iterator[str]:
+    """
+    Fold chunks shorter than min_size into a neighbour when they fit.
+
+    Neighbours share up to max_overlap characters of splitter overlap; the
+    repeated prefix is dropped so merged text is not embedded twice.
+    """
+    pending = None
+    for chunk in chunks:
+        if (
+            pending is not None
+            and min(len(pending.strip()), len(chunk.strip())) < min_size
+            and len(pending) + len(chunk) < max_combined
+        ):
+            head = pending.rstrip()
+            tail = chunk.lstrip()
+            tail = tail[_overlap_length(head, tail, max_overlap) :].lstrip()
+            pending = f"{head}\n{tail}" if tail else head
+        else:
+            if pending is not None:
+                yield pending
+            pending = chunk
+    if pending is not None:
+        yield pending
+
+
+def _overlap_length(head: str, tail: str, max_overlap: int) -> int:
+    """Length of the longest word-aligned prefix of tail that ends head."""
+    longest = min(max_overlap, len(head), len(tail))
+    for size in range(longest, MIN_MERGE_OVERLAP - 1, -1):
+        if (
+            head.endswith(tail[:size])
+            and (size == len(tail) or tail[size].isspace())
+            and (size == len(head) or head[-size - 1].isspace())
+        ):
+            return size
+    return 0
+
+
+def _resplit_large(chunks: Iterable[str], max_size: int, split) -> Iterator[str]:
+    """Split chunks longer than max_size again with the given split function."""
+    for chunk in chunks:
+        if len(chunk) > max_size:
+            yield from split(chunk)
+        else:
+            yield chunk
+
+
+class TokenWindowSplitter:
+    """
+    Token splitter that encodes the whole text once.
+
+    Overlapping windows are sliced from a single list of token ids and
+    decoded in one batch call, instead of tokenizing per candidate split.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        encoding_name: str = "cl100k_base",
+    ):
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into overlapping windows of at most chunk_size tokens."""
+        ids = self._encoding.encode(text, disallowed_special=())
+        step = self.chunk_size - self.chunk_overlap
+        windows = [
+            ids[start : start + self.chunk_size]
+            for start in range(0, len(ids), step)
+            if start == 0 or start + self.chunk_overlap < len(ids)
+        ]
+        return self._encoding.decode_batch(windows)
+
+
+class RustRecursiveSplitter:
+    """
+    Recursive splitter backed by the Rust text-splitter crate.
+
+    Splits on the same semantic levels as the recursive strategy (paragraphs,
+    lines, sentences, words) without holding the GIL in Python loops.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        self._splitter = RustTextSplitter(chunk_size, overlap=chunk_overlap)
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into chunks of at most chunk_size characters."""
+        return self._splitter.chunks(text)
+
 
 class TextChunker:
     """
@@ -367,6 +648,7 @@ class TextChunker:
         strategy: ChunkingStrategy = ChunkingStrategy.RECURSIVE,
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
+        use_rust: bool = False,
     ):
         """
         Initialize the text chunker.
@@ -375,20 +657,30 @@ class TextChunker:
             strategy: Chunking strategy to use
             chunk_size: Target size for each chunk
             chunk_overlap: Number of characters to overlap between chunks
+            use_rust: Use the Rust splitter for the recursive strategy
         """
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+
         self.strategy = strategy
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.use_rust = use_rust and HAS_RUST_SPLITTER
+        # Recursive separators, strongest first, with the minimum offset into
+        # the window at which each one may end a chunk
+        half = chunk_size // 2
+        self._separators = [("\n\n", half), ("\n", half), (". ", half), (" ", 1)]
         self._splitter = self._create_splitter()
 
     def _create_splitter(self):
         """Create the appropriate text splitter based on strategy."""
         if self.strategy == ChunkingStrategy.RECURSIVE:
-            return RecursiveCharacterTextSplitter(
-                chunk_size=self.chunk_size,
-                chunk_overlap=self.chunk_overlap,
-                separators=["\n\n", "\n", ". ", " ", ""],
-            )
+            if self.use_rust:
+                return RustRecursiveSplitter(
+                    chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
+                )
+            # Handled by _split_then_merge
+            return None
         elif self.strategy == ChunkingStrategy.CHARACTER:
             return CharacterTextSplitter(
                 chunk_size=self.chunk_size,
@@ -396,6 +688,10 @@ class TextChunker:
                 separator="\n",
             )
         elif self.strategy == ChunkingStrategy.TOKEN:
+            if HAS_TIKTOKEN:
+                return TokenWindowSplitter(
+                    chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
+                )
             return TokenTextSplitter(
                 chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
             )
@@ -405,6 +701,48 @@ class TextChunker:
                 chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
             )
 
+    def _split(self, text: str) -> List[str]:
+        """Split text with the configured splitter."""
+        if self._splitter is None:
+            return self._split_then_merge(text)
+        return self._splitter.split_text(text)
+
+    def _split_then_merge(self, text: str) -> List[str]:
+        """
+        Cut text into chunks in a single forward pass.
+
+        Each chunk ends at the strongest separator in the back half of its
+        chunk_size window (paragraph, line, sentence), falling back to the
+        last space and then to a hard cut. The next chunk starts up to
+        chunk_overlap characters earlier, aligned to a word boundary.
+        """
+        chunks = []
+        start = 0
+        length = len(text)
+        while start < length:
+            end = start + self.chunk_size
+            if end >= length:
+                chunks.append(text[start:])
+                break
+
+            cut = end
+            for separator, min_cut in self._separators:
+                index = text.rfind(separator, start + min_cut, end)
+                if index != -1:
+                    cut = index + len(separator)
+                    break
+            chunks.append(text[start:cut])
+
+            next_start = cut - self.chunk_overlap
+            if next_start > start:
+                space = text.find(" ", next_start, cut)
+                next_start = space + 1 if space != -1 else cut
+            # A chunk cut short of the overlap must still move forward by at
+            # least half its length, or each step would repeat most of it
+            start = max(next_start, start + (cut - start + 1) // 2)
+
+        return chunks
+
     def chunk_text(self, text: str, source_document: str) -> List[DocumentChunk]:
         """
         Split text into chunks and create DocumentChunk objects.
@@ -420,29 +758,37 @@ class TextChunker:
             return []
 
         # Split the text
-        chunks = self._splitter.split_text(text)
-
-        # Create DocumentChunk objects
-        document_chunks = []
-        for i, chunk_content in enumerate(chunks):
-            if chunk_content.strip():  # Only include non-empty chunks
-                chunk_id = f"{source_document}_{i:04d}"
-
-                chunk = DocumentChunk(
-                    chunk_id=chunk_id,
-                    content=chunk_content,
-                    chunk_index=i,
-                    source_document=source_document,
-                    metadata={
-                        "chunking_strategy": self.strategy.value,
-                        "chunk_size": self.chunk_size,
-                        "chunk_overlap": self.chunk_overlap,
-                        "character_count": len(chunk_content),
-                    },
-                )
-                document_chunks.append(chunk)
+        chunks = self._split(text)
+
+        # Fold fragments (e.g. lone headings) into neighbours and cut down
+        # oversized chunks; token windows are measured in tokens, not chars
+        if self.strategy != ChunkingStrategy.TOKEN:
+            chunks = _merge_small(
+                chunks,
+                min_size=self.chunk_size // 10,
+                max_combined=int(self.chunk_size * 1.15),
+                max_overlap=self.chunk_overlap,
+            )
+            chunks = _resplit_large(
+                chunks, max_size=int(self.chunk_size * 1.1), split=self._split
+            )
 
-        return document_chunks
+        # The post-passes above are generators, so splitting, merging,
+        # stripping and empty-filtering happen in a single pass. Plain
+        # construction is kept: pydantic-core validation is faster than the
+        # pure-Python model_construct path. Chunking parameters are recorded
+        # once on DocumentMetadata.
+        id_prefix = f"{source_document}_"
+        return [
+            DocumentChunk(
+                chunk_id=id_prefix + f"{i:04d}",
+                content=content,
+                chunk_index=i,
+                source_document=source_document,
+                metadata={"character_count": len(content)},
+            )
+            for i, content in enumerate(filter(None, map(str.strip, chunks)))
+        ]
 
 
 class DocumentProcessor:
@@ -466,11 +812,21 @@ class DocumentProcessor:
         """
         self.config = config or get_config()
         self.loaders = self._initialize_loaders()
+        # Built once so per-file dispatch is a single dict lookup
+        self._ext_to_loader: Dict[str, DocumentLoader] = {
+            ext: loader
+            for loader in set(self.loaders.values())
+            for ext in loader.supported_extensions
+        }
+        self._supported_formats = sorted(self._ext_to_loader)
         self.chunker = TextChunker(
             strategy=ChunkingStrategy.RECURSIVE,
             chunk_size=self.config.vector_store.chunk_size,
             chunk_overlap=self.config.vector_store.chunk_overlap,
+            use_rust=self.config.vector_store.use_rust_splitter,
         )
+        # Processed results keyed by (resolved path, mtime_ns, size)
+        self._doc_cache: Dict[tuple, Dict[str, Any]] = {}
 
     def _initialize_loaders(self) -> Dict[DocumentType, DocumentLoader]:
         """Initialize document loaders for different file types."""
@@ -482,10 +838,10 @@ class DocumentProcessor:
         loaders[DocumentType.MD] = text_loader
 
         # Conditional loaders based on dependencies
-        if HAS_PYPDF or HAS_LANGCHAIN_LOADERS:
+        if HAS_PYMUPDF or HAS_PYPDF or HAS_LANGCHAIN_LOADERS:
             loaders[DocumentType.PDF] = PDFLoader()
 
-        if HAS_DOCX or HAS_LANGCHAIN_LOADERS:
+        if HAS_LXML or HAS_DOCX or HAS_LANGCHAIN_LOADERS:
             docx_loader = DOCXLoader()
             loaders[DocumentType.DOCX] = docx_loader
             loaders[DocumentType.DOC] = docx_loader
@@ -494,40 +850,27 @@ class DocumentProcessor:
 
     def get_supported_formats(self) -> List[str]:
         """Get list of supported file formats."""
-        formats = []
-        for loader in self.loaders.values():
-            formats.extend(loader.supported_extensions)
-        return sorted(list(set(formats)))
+        return list(self._supported_formats)
 
     def can_process(self, file_path: Union[str, Path]) -> bool:
         """Check if the processor can handle the given file."""
-        file_path = Path(file_path)
-        document_type = self._get_document_type(file_path)
-        return document_type in self.loaders
+        return Path(file_path).suffix.lower() in self._ext_to_loader
 
     def _get_document_type(self, file_path: Path) -> DocumentType:
         """Determine document type from file extension."""
         extension = file_path.suffix.lower()
 
-        type_mapping = {
-            ".pdf": DocumentType.PDF,
-            ".docx": DocumentType.DOCX,
-            ".doc": DocumentType.DOC,
-            ".txt": DocumentType.TXT,
-            ".md": DocumentType.MD,
-            ".html": DocumentType.HTML,
-            ".json": DocumentType.JSON,
-            ".csv": DocumentType.CSV,
-        }
-
-        return type_mapping.get(extension, DocumentType.UNKNOWN)
+        return EXTENSION_TO_TYPE.get(extension, DocumentType.UNKNOWN)
 
-    def process_document(self, file_path: Union[str, Path]) -> Dict[str, Any]:
+    def process_document(
+        self, file_path: Union[str, Path], keep_original: bool = False
+    ) -> Dict[str, Any]:
         """
         Process a single document and return chunks with metadata.
 
         Args:
             file_path: Path to the document file
+            keep_original: Include the full extracted text as "original_content"
 
         Returns:
             Dictionary containing chunks and metadata
@@ -541,16 +884,46 @@ class DocumentProcessor:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
+        # Unchanged files are served from the cache without re-extraction;
+        # the cache never holds the full text, so keep_original re-extracts
+        key = self._cache_key(file_path)
+        if key in self._doc_cache and not keep_original:
+            return copy.deepcopy(self._doc_cache[key])
+
+        return self._remember(key, self._process_uncached(file_path, keep_original))
+
+    def process_text(self, text: str, source: str) -> List[DocumentChunk]:
+        """
+        Chunk text held in memory, without writing it to a file first.
+
+        Args:
+            text: Text content to chunk
+            source: Name recorded as each chunk's source document
+
+        Returns:
+            List of DocumentChunk objects
+
+        Raises:
+            ValueError: If the text is empty
+        """
+        if not text or not text.strip():
+            raise ValueError(f"No content in {source}")
+
+        return self.chunker.chunk_text(text, source)
+
+    def _process_uncached(
+        self, file_path: Path, keep_original: bool = False
+    ) -> Dict[str, Any]:
+        """Load, chunk and describe a document without consulting the cache."""
         # Determine document type and get appropriate loader
         document_type = self._get_document_type(file_path)
 
-        if document_type not in self.loaders:
+        loader = self._ext_to_loader.get(file_path.suffix.lower())
+        if loader is None:
             raise ValueError(
                 f"Unsupported document type: {document_type.value} for file {file_path}"
             )
 
-        loader = self.loaders[document_type]
-
         # Load content
         try:
             content = loader.load_content(file_path)
@@ -578,43 +951,222 @@ class DocumentProcessor:
             chunk_overlap=self.chunker.chunk_overlap,
         )
 
-        return {"chunks": chunks, "metadata": metadata, "original_content": content}
+        result = {"chunks": chunks, "metadata": metadata}
+        if keep_original:
+            result["original_content"] = content
+        return result
+
+    @staticmethod
+    def _cache_key(file_path: Path) -> tuple:
+        """Identify a file version by its resolved path, mtime and size."""
+        stat = file_path.stat()
+        return (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    def _remember(self, key: tuple, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a processing result and return a copy the caller may mutate."""
+        # Evict the oldest entry; long-lived services pass many temp files
+        if len(self._doc_cache) >= DOC_CACHE_MAX_ENTRIES:
+            self._doc_cache.pop(next(iter(self._doc_cache)))
+        self._doc_cache[key] = {
+            name: value for name, value in result.items() if name != "original_content"
+        }
+        return copy.deepcopy(result)
 
     def process_directory(
-        self, directory_path: Union[str, Path], recursive: bool = True
+        self,
+        directory_path: Union[str, Path],
+        recursive: bool = True,
+        max_workers: Optional[int] = None,
+        extensions: Optional[Iterable[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Process all supported documents in a directory.
 
+        Files are extracted in parallel worker processes, since loading and
+        chunking are CPU-bound and independent per file.
+
         Args:
             directory_path: Path to the directory
             recursive: Whether to process subdirectories
+            max_workers: Number of worker processes (defaults to CPU count)
+            extensions: Only process files with these suffixes (e.g. ".pdf")
 
         Returns:
             List of processing results for each document
         """
+        return list(
+            self.iter_process_directory(
+                directory_path, recursive, max_workers, extensions
+            )
+        )
+
+    def iter_process_directory(
+        self,
+        directory_path: Union[str, Path],
+        recursive: bool = True,
+        max_workers: Optional[int] = None,
+        extensions: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield processing results for a directory one document at a time.
+
+        Callers such as embedders can consume and discard each result instead
+        of holding the whole directory in memory.
+
+        Args:
+            directory_path: Path to the directory
+            recursive: Whether to process subdirectories
+            max_workers: Number of worker processes (defaults to CPU count)
+            extensions: Only process files with these suffixes (e.g. ".pdf")
+
+        Yields:
+            Processing result for each document, in file order
+        """
         directory_path = Path(directory_path)
 
         if not directory_path.exists() or not directory_path.is_dir():
             raise ValueError(f"Invalid directory: {directory_path}")
 
-        results = []
+        file_paths = list(self._iter_files(directory_path, recursive, extensions))
 
-        # Get file pattern based on recursive flag
-        pattern = "**/*" if recursive else "*"
+        if not file_paths:
+            return
 
-        for file_path in directory_path.glob(pattern):
-            if file_path.is_file() and self.can_process(file_path):
-                try:
-                    result = self.process_document(file_path)
-                    result["status"] = "success"
-                    results.append(result)
-                except Exception as e:
-                    results.append(
-                        {"filepath": str(file_path), "status": "error", "error": str(e)}
+        if max_workers is None:
+            max_workers = self._get_max_workers(len(file_paths))
+
+        if max_workers <= 1:
+            # Overlap disk reads with parsing by prefetching the next file
+            for index, file_path in enumerate(file_paths):
+                if index + 1 < len(file_paths):
+                    self._prefetch(file_paths[index + 1])
+                yield self._collect_result(file_path, self.process_document, file_path)
+            return
+
+        # Only files missing from the cache are sent to the worker pool. A
+        # file that vanished since the listing keeps its stat error so it
+        # gets an error result instead of aborting the whole directory
+        keys: List[Union[tuple, OSError]] = []
+        for file_path in file_paths:
+            try:
+                keys.append(self._cache_key(file_path))
+            except OSError as e:
+                keys.append(e)
+        pending = [
+            (file_path, key)
+            for file_path, key in zip(file_paths, keys)
+            if isinstance(key, tuple) and key not in self._doc_cache
+        ]
+        if not pending:
+            for file_path in file_paths:
+                yield self._collect_result(file_path, self.process_document, file_path)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(pending)),
+            initializer=_init_worker_processor,
+            initargs=(self.config,),
+        ) as executor:
+            futures = {
+                key: executor.submit(_process_in_worker, file_path)
+                for file_path, key in pending
+            }
+
+            for file_path, key in zip(file_paths, keys):
+                if isinstance(key, OSError):
+                    yield self._collect_result(file_path, _reraise, key)
+                    continue
+                if key in futures:
+                    # Drop the future once consumed so its result can be freed
+                    produce = lambda f=futures.pop(key), k=key: self._remember(
+                        k, f.result()
                     )
+                else:
+                    produce = lambda k=key: copy.deepcopy(self._doc_cache[k])
+                yield self._collect_result(file_path, produce)
+
+    def _iter_files(
+        self, root: Path, recursive: bool, extensions: Optional[Iterable[str]] = None
+    ) -> Iterator[Path]:
+        """
+        Yield supported files under root using os.scandir.
+
+        Suffixes are checked on the cached directory entry, so unsupported
+        files never become Path objects or cost an extra stat.
+        """
+        suffixes = self._ext_to_loader.keys()
+        if extensions is not None:
+            suffixes = suffixes & {extension.lower() for extension in extensions}
+        stack = [root]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif (
+                        os.path.splitext(entry.name)[1].lower() in suffixes
+                        and entry.is_file()
+                    ):
+                        yield Path(entry.path)
+
+    @staticmethod
+    def _prefetch(file_path: Path) -> None:
+        """Ask the OS to start reading a file into the page cache."""
+        if not hasattr(os, "posix_fadvise"):  # Not available on Windows/macOS
+            return
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _get_max_workers(file_count: int) -> int:
+        """Get the number of worker processes for a batch of files."""
+        return min(file_count, os.cpu_count() or 4)
+
+    @staticmethod
+    def _collect_result(file_path: Path, produce, *args) -> Dict[str, Any]:
+        """Run `produce` and wrap its outcome as a success or error result."""
+        try:
+            result = produce(*args)
+            result["status"] = "success"
+            return result
+        except Exception as e:
+            return {"filepath": str(file_path), "status": "error", "error": str(e)}
+
+
+def _reraise(error: Exception) -> Dict[str, Any]:
+    """Raise an error captured earlier, for reporting through _collect_result."""
+    raise error
+
+
+# Per-process processor used by process_directory workers
+_worker_processor: Optional[DocumentProcessor] = None
+
+
+def _init_worker_processor(config) -> None:
+    """Build the worker's DocumentProcessor once when the process starts."""
+    global _worker_processor
+    _worker_processor = DocumentProcessor(config)
+
+
+def _process_in_worker(file_path: Path) -> Dict[str, Any]:
+    """Process a single document inside a worker process."""
+    return _worker_processor._process_uncached(Path(file_path))
+
 
-        return results
+def _extract_pdf_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) of a PDF with PyMuPDF."""
+    with pymupdf.open(file_path) as doc:
+        return [
+            doc[page_num].get_text("text", flags=PDF_TEXT_FLAGS)
+            for page_num in range(start, stop)
+        ]
 
 
 # Utility functions
@@ -17,20 +17,135 @@ Key Features:
 """
 
 import os
+import re
 import json
+import logging
 import time
 import asyncio
 import aiohttp
 from typing import List, Dict, Any, Optional, Union
-from datetime import datetime, timezone
 from enum import Enum
-from urllib.parse import quote
+from urllib.parse import quote, urlparse
 import base64
+from collections import OrderedDict
+from itertools import islice
 
 from pydantic import BaseModel, Field, field_validator
 
+# Optional faster JSON parser for API responses
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 from agent_core import Tool, ToolType, ToolResult
 
+logger = logging.getLogger(__name__)
+
+
+# Common question words and phrases dropped when simplifying code queries
+STOP_WORDS = frozenset(
+    {
+        "can",
+        "you",
+        "looking",
+        "for",
+        "the",
+        "github",
+        "about",
+        "and",
+        "tell",
+        "me",
+        "how",
+        "many",
+        "results",
+        "have",
+        "got",
+        "search",
+        "find",
+        "show",
+        "get",
+        "please",
+        "help",
+        "what",
+        "where",
+        "when",
+        "why",
+        "who",
+        "which",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+        "do",
+        "does",
+        "did",
+        "will",
+        "would",
+        "could",
+        "should",
+        "may",
+        "might",
+        "must",
+        "shall",
+        "to",
+        "of",
+        "in",
+        "on",
+        "at",
+        "by",
+        "from",
+        "with",
+        "without",
+        "through",
+        "during",
+        "before",
+        "after",
+        "above",
+        "below",
+        "up",
+        "down",
+        "out",
+        "off",
+        "over",
+        "under",
+        "again",
+        "further",
+        "then",
+        "once",
+        "a",
+        "an",
+        "as",
+        "so",
+        "than",
+        "too",
+        "very",
+        "just",
+        "now",
+        "here",
+        "there",
+        "where",
+        "this",
+        "that",
+        "these",
+        "those",
+    }
+)
+
+_WORD_RE = re.compile(r"\b\w+\b")
+
+# Headers shared by every GitHub API client; copied per instance since the
+# Authorization header is added on top
+_BASE_HEADERS = {
+    "Accept": "application/vnd.github.v3+json",
+    "User-Agent": "RAG-System-GitHub-Search/1.0",
+}
+
 
 class GitHubSearchType(str, Enum):
     """Types of GitHub searches available."""
@@ -43,6 +158,9 @@ class GitHubSearchType(str, Enum):
     TOPICS = "topics"
 
 
+_VALID_SEARCH_TYPES = frozenset(t.value for t in GitHubSearchType)
+
+
 class GitHubSearchResult(BaseModel):
     """Individual GitHub search result."""
 
@@ -59,75 +177,234 @@ class GitHubSearchResult(BaseModel):
     )
 
 
+# Retries for rate-limited (403/429) search requests, and the longest wait
+# worth sleeping through instead of failing
+GITHUB_MAX_RETRIES = 3
+GITHUB_MAX_RETRY_WAIT = 60
+
+# Rate-limit state per token, shared by every tool instance since GitHub
+# scopes its quota to the credential rather than the client
+_RATE_STATE: Dict[str, Dict[str, float]] = {}
+
+
+def _rate_state(token: Optional[str]) -> Dict[str, float]:
+    """Get the shared rate-limit counters for a token (or anonymous use)."""
+    return _RATE_STATE.setdefault(
+        token or "anon",
+        {"remaining": 5000 if token else 60, "reset": time.time()},
+    )
+
+
+def _record_rate_limit(state: Dict[str, float], headers) -> None:
+    """Update rate-limit counters from a response's X-RateLimit-* headers."""
+    state["remaining"] = int(headers.get("X-RateLimit-Remaining", state["remaining"]))
+    state["reset"] = int(headers.get("X-RateLimit-Reset", state["reset"]))
+
+
+# Media type that makes the contents API return the file body as-is
+GITHUB_RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
+# Default number of leading bytes kept from each fetched file
+DEFAULT_MAX_CONTENT_BYTES = 64 * 1024
+
+
+class TTLCache:
+    """
+    Small LRU cache whose entries expire a fixed time after insertion.
+
+    Reads refresh an entry's LRU position but never its expiry: only `set`
+    stamps `expires_at`. Extending the TTL on every hit would keep a hot
+    entry alive forever and serve it arbitrarily stale, so this is
+    deliberate.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300):
+        """Initialize with the maximum entry count and lifetime in seconds."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired (TTL unchanged)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = (time.time() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def default_max_concurrency(github_token: Optional[str]) -> int:
+    """Get the default number of concurrent GitHub API requests."""
+    return 10 if github_token else 2
+
+
+class GitHubSession:
+    """
+    Lazily created aiohttp session reused across GitHub API requests.
+
+    Keeping one session keeps TCP/TLS connections to the API alive between
+    calls. A new session is opened if the previous one was closed or belongs
+    to a different event loop. `semaphore` caps requests in flight so bursts
+    stay under GitHub's secondary rate limits.
+    """
+
+    def __init__(self, headers: Dict[str, str], max_concurrency: int = 10):
+        """Initialize with the default headers sent on every request."""
+        self.headers = headers
+        self.max_concurrency = max_concurrency
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                await self._close_stale()
+            self._session = aiohttp.ClientSession(
+                # Hold idle connections long enough to survive the gap
+                # between one tool call and the next
+                connector=aiohttp.TCPConnector(
+                    limit=20, ttl_dns_cache=300, keepalive_timeout=60
+                ),
+                headers=self.headers,
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def _close_stale(self) -> None:
+        """Close a session left open by another event loop."""
+        try:
+            await self._session.close()
+        except Exception as e:
+            # Its connections are bound to the old loop, which may be gone
+            print(f"Warning: Could not close stale GitHub session: {e}")
+        self._session = None
+
+    async def aclose(self) -> None:
+        """Close the shared session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
 class GitHubContentFetcher:
     """Fetches actual content from GitHub files and repositories."""
 
-    def __init__(self, github_token: Optional[str] = None):
-        """Initialize content fetcher."""
+    def __init__(
+        self,
+        github_token: Optional[str] = None,
+        session: Optional[GitHubSession] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """Initialize content fetcher, optionally sharing a tool's session."""
         self.github_token = github_token or os.getenv("GITHUB_TOKEN")
         self.base_url = "https://api.github.com"
-        self.headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "RAG-System-GitHub-Search/1.0",
-        }
+        self.headers = dict(_BASE_HEADERS)
 
         if self.github_token:
             self.headers["Authorization"] = f"token {self.github_token}"
 
+        self.session = session or GitHubSession(
+            self.headers, max_concurrency or default_max_concurrency(self.github_token)
+        )
+        self._content_cache = TTLCache(maxsize=256, ttl=600)
+
     async def fetch_file_content(
-        self, owner: str, repo: str, path: str, ref: str = "main"
+        self,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str = "main",
+        max_bytes: Optional[int] = None,
     ) -> Optional[str]:
-        """Fetch content of a specific file from GitHub repository."""
+        """
+        Fetch content of a specific file from GitHub repository.
+
+        With max_bytes set, only that many leading bytes of the file are
+        decoded and returned.
+        """
+        cache_key = (owner, repo, path, ref, max_bytes)
+        cached = self._content_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
-                params = {"ref": ref}
-
-                async with session.get(
-                    url, headers=self.headers, params=params
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # GitHub returns base64 encoded content
-                        if data.get("encoding") == "base64":
-                            content = base64.b64decode(data["content"]).decode("utf-8")
-                            return content
-                        else:
-                            return data.get("content", "")
+            session = await self.session.get()
+            url = f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
+            params = {"ref": ref}
+
+            # Ask for the raw blob so GitHub skips base64-encoding it
+            async with self.session.semaphore, session.get(
+                url, params=params, headers={"Accept": GITHUB_RAW_MEDIA_TYPE}
+            ) as response:
+                if response.status != 200:
+                    logger.warning("❌ Failed to fetch content: HTTP %s", response.status)
+                    return None
+
+                if response.content_type.endswith("json"):
+                    # Non-file entries (e.g. submodules) still come back as JSON
+                    data = await response.json(loads=json_loads)
+                    if data.get("encoding") == "base64":
+                        raw = base64.b64decode(data["content"])
                     else:
-                        print(f"❌ Failed to fetch content: HTTP {response.status}")
-                        return None
+                        raw = data.get("content", "").encode("utf-8")
+                elif max_bytes:
+                    # Stop reading the body once the prefix is in hand
+                    try:
+                        raw = await response.content.readexactly(max_bytes + 1)
+                    except asyncio.IncompleteReadError as e:
+                        raw = e.partial
+                else:
+                    raw = await response.read()
+
+            if max_bytes and len(raw) > max_bytes:
+                # The cut may split a multi-byte character
+                content = raw[:max_bytes].decode("utf-8", errors="replace")
+            else:
+                content = raw.decode("utf-8")
+
+            self._content_cache.set(cache_key, content)
+            return content
         except Exception as e:
-            print(f"❌ Error fetching content: {str(e)}")
+            logger.warning("❌ Error fetching content: %s", e)
             return None
 
     def extract_repo_info_from_url(self, url: str) -> Optional[Dict[str, str]]:
         """Extract owner, repo, and path from GitHub URL."""
         try:
-            # Handle different GitHub URL formats
-            if "github.com" in url:
-                # Remove protocol and www
-                url = (
-                    url.replace("https://", "")
-                    .replace("http://", "")
-                    .replace("www.", "")
-                )
-
-                # Parse URL parts
-                parts = url.split("/")
-                if len(parts) >= 3 and parts[0] == "github.com":
-                    owner = parts[1]
-                    repo = parts[2]
-
-                    # Extract file path if present
-                    if len(parts) > 4 and parts[3] == "blob":
-                        ref = parts[4]  # branch/commit
-                        path = "/".join(parts[5:]) if len(parts) > 5 else ""
-                        return {"owner": owner, "repo": repo, "path": path, "ref": ref}
-                    else:
-                        return {"owner": owner, "repo": repo, "path": "", "ref": "main"}
-            return None
+            # Accept URLs with or without a scheme
+            parsed = urlparse(url if "://" in url else f"//{url}")
+            if parsed.netloc.lower().removeprefix("www.") != "github.com":
+                return None
+
+            parts = parsed.path.strip("/").split("/")
+            if len(parts) < 2:
+                return None
+
+            owner, repo = parts[0], parts[1]
+
+            # Extract file path if present
+            if len(parts) > 3 and parts[2] == "blob":
+                ref = parts[3]  # branch/commit
+                path = "/".join(parts[4:])
+                return {"owner": owner, "repo": repo, "path": path, "ref": ref}
+            return {"owner": owner, "repo": repo, "path": "", "ref": "main"}
         except Exception:
             return None
 
@@ -135,7 +412,9 @@ class GitHubContentFetcher:
 class GitHubSearchWithContentTool(Tool):
     """Enhanced GitHub search tool that can fetch actual code content."""
 
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(
+        self, github_token: Optional[str] = None, max_concurrency: Optional[int] = None
+    ):
         """Initialize GitHub search tool with content fetching capability."""
         super().__init__(
             name="github_search_with_content",
@@ -145,19 +424,24 @@ class GitHubSearchWithContentTool(Tool):
 
         self.github_token = github_token or os.getenv("GITHUB_TOKEN")
         self.base_url = "https://api.github.com"
-        self.rate_limit_remaining = 60
-        self.rate_limit_reset = time.time()
-        self.content_fetcher = GitHubContentFetcher(github_token)
+        self._rl = _rate_state(self.github_token)
 
         # Setup headers
-        self.headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "RAG-System-GitHub-Search/1.0",
-        }
+        self.headers = dict(_BASE_HEADERS)
 
         if self.github_token:
             self.headers["Authorization"] = f"token {self.github_token}"
-            self.rate_limit_remaining = 5000
+
+        # Search requests and content fetches share one connection pool
+        self.session = GitHubSession(
+            self.headers, max_concurrency or default_max_concurrency(self.github_token)
+        )
+        self.content_fetcher = GitHubContentFetcher(github_token, session=self.session)
+        self._search_cache = TTLCache(maxsize=512, ttl=300)
+
+    async def aclose(self) -> None:
+        """Close the tool's HTTP session."""
+        await self.session.aclose()
 
     async def execute(
         self,
@@ -166,14 +450,15 @@ class GitHubSearchWithContentTool(Tool):
         language: Optional[str] = None,
         fetch_content: bool = True,
         max_content_files: int = 3,
+        max_content_bytes: Optional[int] = DEFAULT_MAX_CONTENT_BYTES,
         **kwargs,
     ) -> ToolResult:
         """Execute GitHub search and optionally fetch content."""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
-            print(f"🔍 GitHub Search with Content - Query: '{query}'")
-            print(f"🔍 Language: {language}, Fetch content: {fetch_content}")
+            logger.debug("🔍 GitHub Search with Content - Query: '%s'", query)
+            logger.debug("🔍 Language: %s, Fetch content: %s", language, fetch_content)
 
             # First, perform the search using existing logic
             search_result = await self._perform_github_search(
@@ -183,46 +468,62 @@ class GitHubSearchWithContentTool(Tool):
             results_with_content = []
 
             if search_result.get("items") and fetch_content:
-                print(
-                    f"📥 Fetching content for up to {max_content_files} files from {len(search_result['items'])} results..."
+                logger.debug(
+                    "📥 Fetching content for up to %s files from %s results...",
+                    max_content_files,
+                    len(search_result["items"]),
+                )
+
+                # Build result rows and fetch targets in one pass, skipping
+                # items too malformed to fetch
+                targets = []
+                for i, item in enumerate(
+                    islice(search_result["items"], max_content_files)
+                ):
+                    repo = item.get("repository") or {}
+                    results_with_content.append(
+                        {
+                            "title": item.get("name", "Unknown"),
+                            "url": item.get("html_url", ""),
+                            "repository": repo.get("full_name", ""),
+                            "path": item.get("path", ""),
+                            "score": item.get("score", 0.0),
+                            "content": None,
+                        }
+                    )
+                    owner = (repo.get("owner") or {}).get("login")
+                    if owner and repo.get("name") and item.get("path"):
+                        targets.append((i, owner, repo["name"], item["path"]))
+
+                # Fetch all files concurrently; one failure doesn't cancel the rest
+                contents = await asyncio.gather(
+                    *(
+                        self.content_fetcher.fetch_file_content(
+                            owner, repo_name, file_path, max_bytes=max_content_bytes
+                        )
+                        for _, owner, repo_name, file_path in targets
+                    ),
+                    return_exceptions=True,
                 )
+                for (i, owner, repo_name, file_path), content in zip(targets, contents):
+                    if content and not isinstance(content, BaseException):
+                        results_with_content[i]["content"] = content
+                        logger.debug(
+                            "✅ Fetched %s characters from %s/%s/%s",
+                            len(content),
+                            owner,
+                            repo_name,
+                            file_path,
+                        )
+                    else:
+                        logger.debug(
+                            "❌ Failed to fetch content from %s/%s/%s",
+                            owner,
+                            repo_name,
+                            file_path,
+                        )
 
-                for i, item in enumerate(search_result["items"][:max_content_files]):
-                    result_data = {
-                        "title": item.get("name", "Unknown"),
-                        "url": item.get("html_url", ""),
-                        "repository": item.get("repository", {}).get("full_name", ""),
-                        "path": item.get("path", ""),
-                        "score": item.get("score", 0.0),
-                        "content": None,
-                    }
-
-                    # Try to fetch the actual content
-                    if "repository" in item and "path" in item:
-                        repo_info = item["repository"]
-                        owner = repo_info.get("owner", {}).get("login", "")
-                        repo_name = repo_info.get("name", "")
-                        file_path = item.get("path", "")
-
-                        if owner and repo_name and file_path:
-                            print(
-                                f"📦 Fetching content from {owner}/{repo_name}/{file_path}"
-                            )
-                            content = await self.content_fetcher.fetch_file_content(
-                                owner, repo_name, file_path
-                            )
-
-                            if content:
-                                result_data["content"] = content
-                                print(
-                                    f"✅ Successfully fetched {len(content)} characters"
-                                )
-                            else:
-                                print(f"❌ Failed to fetch content")
-
-                    results_with_content.append(result_data)
-
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
 
             return ToolResult(
                 tool_name=self.name,
@@ -242,7 +543,7 @@ class GitHubSearchWithContentTool(Tool):
             )
 
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
             return ToolResult(
                 tool_name=self.name,
                 success=False,
@@ -262,40 +563,40 @@ class GitHubSearchWithContentTool(Tool):
         search_query = " ".join(search_parts)
 
         # Perform search
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/search/{search_type}"
-            params = {
-                "q": search_query,
-                "sort": kwargs.get("sort", "best-match"),
-                "order": kwargs.get("order", "desc"),
-                "per_page": min(
-                    kwargs.get("per_page", 5), 10
-                ),  # Limit to avoid rate limits
-                "page": kwargs.get("page", 1),
-            }
-
-            print(f"🌐 API Request URL: {url}")
-            print(f"🌐 Parameters: {params}")
-            print(f"🌐 Headers: {self.headers}")
-
-            async with session.get(
-                url, headers=self.headers, params=params
-            ) as response:
-                print(f"📊 API Response Status: {response.status}")
+        session = await self.session.get()
+        url = f"{self.base_url}/search/{search_type}"
+        params = {
+            "q": search_query,
+            "sort": kwargs.get("sort", "best-match"),
+            "order": kwargs.get("order", "desc"),
+            "per_page": min(kwargs.get("per_page", 5), 10),  # Limit to avoid rate limits
+            "page": kwargs.get("page", 1),
+        }
 
-                # Update rate limit info
-                self.rate_limit_remaining = int(
-                    response.headers.get("X-RateLimit-Remaining", 0)
-                )
-                print(f"📊 Rate Limit Remaining: {self.rate_limit_remaining}")
+        cache_key = (search_type, *params.values())
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    raise Exception(
-                        f"GitHub API error: {response.status} - {error_text}"
-                    )
+        logger.debug("🌐 API Request URL: %s", url)
+        logger.debug("🌐 Parameters: %s", params)
+
+        async with self.session.semaphore, session.get(
+            url, params=params
+        ) as response:
+            logger.debug("📊 API Response Status: %s", response.status)
+
+            # Update rate limit info
+            _record_rate_limit(self._rl, response.headers)
+            logger.debug("📊 Rate Limit Remaining: %s", self._rl["remaining"])
+
+            if response.status == 200:
+                result = await response.json(loads=json_loads)
+                self._search_cache.set(cache_key, result)
+                return result
+            else:
+                error_text = await response.text()
+                raise Exception(f"GitHub API error: {response.status} - {error_text}")
 
     def _get_parameters_schema(self) -> Dict[str, Any]:
         """Get parameters schema."""
@@ -334,7 +635,9 @@ class GitHubSearchWithContentTool(Tool):
 class GitHubSearchTool(Tool):
     """Tool for searching GitHub repositories, code, and issues."""
 
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(
+        self, github_token: Optional[str] = None, max_concurrency: Optional[int] = None
+    ):
         """Initialize GitHub search tool."""
         super().__init__(
             name="github_search",
@@ -344,18 +647,30 @@ class GitHubSearchTool(Tool):
 
         self.github_token = github_token or os.getenv("GITHUB_TOKEN")
         self.base_url = "https://api.github.com"
-        self.rate_limit_remaining = 60  # Default for unauthenticated requests
-        self.rate_limit_reset = time.time()
+        self._rl = _rate_state(self.github_token)
 
         # Setup headers
-        self.headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "RAG-System-GitHub-Search/1.0",
-        }
+        self.headers = dict(_BASE_HEADERS)
 
         if self.github_token:
             self.headers["Authorization"] = f"token {self.github_token}"
-            self.rate_limit_remaining = 5000  # Authenticated requests
+
+        self.session = GitHubSession(
+            self.headers, max_concurrency or default_max_concurrency(self.github_token)
+        )
+        self._search_cache = TTLCache(maxsize=512, ttl=300)
+
+        # Result formatter per search type, picked once per response
+        self._formatters = {
+            "code": self._format_code,
+            "repositories": self._format_repo,
+            "issues": self._format_issue,
+            "users": self._format_user,
+        }
+
+    async def aclose(self) -> None:
+        """Close the tool's HTTP session."""
+        await self.session.aclose()
 
     async def execute(
         self,
@@ -370,19 +685,19 @@ class GitHubSearchTool(Tool):
         page: int = 1,
     ) -> ToolResult:
         """Execute GitHub search."""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
-            print(f"🔍 GitHub Search - Original query: '{query}'")
-            print(f"🔍 Search type: {search_type}, Language: {language}")
+            logger.debug("🔍 GitHub Search - Original query: '%s'", query)
+            logger.debug("🔍 Search type: %s, Language: %s", search_type, language)
 
             # Validate search type
-            if search_type not in [t.value for t in GitHubSearchType]:
+            if search_type not in _VALID_SEARCH_TYPES:
                 raise ValueError(f"Invalid search type: {search_type}")
 
             # Check rate limits
             if not await self._check_rate_limit():
-                print("❌ Rate limit exceeded")
+                logger.warning("❌ Rate limit exceeded")
                 return ToolResult(
                     tool_name=self.name,
                     success=False,
@@ -395,14 +710,14 @@ class GitHubSearchTool(Tool):
                 query, search_type, language, repository, user
             )
 
-            print(f"🔍 Final search query: '{search_query}'")
+            logger.debug("🔍 Final search query: '%s'", search_query)
 
             # Perform search
             results = await self._perform_search(
                 search_type, search_query, sort, order, per_page, page
             )
 
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
 
             # Format results
             formatted_results = await self._format_results(
@@ -410,15 +725,15 @@ class GitHubSearchTool(Tool):
             )
             total_count = results.get("total_count", 0)
 
-            print(f"📊 GitHub API returned {total_count} total results")
-            print(f"📊 Formatted {len(formatted_results)} results for return")
+            logger.debug("📊 GitHub API returned %s total results", total_count)
+            logger.debug("📊 Formatted %s results for return", len(formatted_results))
 
             if total_count == 0:
-                print("⚠️  No results found. This might indicate:")
-                print("   - Invalid GitHub token")
-                print("   - Query too specific")
-                print("   - API rate limits")
-                print("   - Network issues")
+                logger.debug(
+                    "⚠️  No results found. This might indicate an invalid GitHub "
+                    "token, a query that is too specific, API rate limits or "
+                    "network issues"
+                )
 
             return ToolResult(
                 tool_name=self.name,
@@ -428,7 +743,7 @@ class GitHubSearchTool(Tool):
                     "search_type": search_type,
                     "total_count": total_count,
                     "results": formatted_results,
-                    "rate_limit_remaining": self.rate_limit_remaining,
+                    "rate_limit_remaining": self._rl["remaining"],
                 },
                 execution_time=execution_time,
                 metadata={
@@ -441,7 +756,7 @@ class GitHubSearchTool(Tool):
             )
 
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
             return ToolResult(
                 tool_name=self.name,
                 success=False,
@@ -453,12 +768,11 @@ class GitHubSearchTool(Tool):
         """Check if we can make API requests."""
         current_time = time.time()
 
-        # If rate limit has reset, restore full quota
-        if current_time >= self.rate_limit_reset:
-            self.rate_limit_remaining = 5000 if self.github_token else 60
-            self.rate_limit_reset = current_time + 3600  # Reset in 1 hour
+        # If the reset epoch reported by the API has passed, restore full quota
+        if current_time >= self._rl["reset"]:
+            self._rl["remaining"] = 5000 if self.github_token else 60
 
-        return self.rate_limit_remaining > 0
+        return self._rl["remaining"] > 0
 
     async def _build_search_query(
         self,
@@ -513,150 +827,205 @@ class GitHubSearchTool(Tool):
             "page": page,
         }
 
-        print(f"🌐 API Request URL: {url}")
-        print(f"🌐 Parameters: {params}")
-        print(f"🌐 Headers: {self.headers}")
+        cache_key = (search_type, *params.values())
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        logger.debug("🌐 API Request URL: %s", url)
+        logger.debug("🌐 Parameters: %s", params)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url, headers=self.headers, params=params
+        session = await self.session.get()
+        for attempt in range(GITHUB_MAX_RETRIES + 1):
+            async with self.session.semaphore, session.get(
+                url, params=params
             ) as response:
                 # Update rate limit info
-                self.rate_limit_remaining = int(
-                    response.headers.get("X-RateLimit-Remaining", 0)
-                )
-                self.rate_limit_reset = int(
-                    response.headers.get("X-RateLimit-Reset", time.time())
-                )
+                _record_rate_limit(self._rl, response.headers)
 
-                print(f"📊 API Response Status: {response.status}")
-                print(f"📊 Rate Limit Remaining: {self.rate_limit_remaining}")
+                logger.debug("📊 API Response Status: %s", response.status)
+                logger.debug("📊 Rate Limit Remaining: %s", self._rl["remaining"])
 
-                if response.status == 200:
-                    json_data = await response.json()
-                    print(
-                        f"📊 API returned {json_data.get('total_count', 0)} total results"
+                if self._is_rate_limited(response) and attempt < GITHUB_MAX_RETRIES:
+                    delay = self._get_retry_delay(response, attempt)
+                else:
+                    delay = None
+
+                if delay is not None:
+                    logger.info("⏳ Rate limited, retrying in %.1fs", delay)
+                elif response.status == 200:
+                    json_data = await response.json(loads=json_loads)
+                    logger.debug(
+                        "📊 API returned %s total results, %s items",
+                        json_data.get("total_count", 0),
+                        len(json_data.get("items", [])),
                     )
-                    print(f"📊 API returned {len(json_data.get('items', []))} items")
+                    self._search_cache.set(cache_key, json_data)
                     return json_data
-                elif response.status == 403:
+                elif self._is_rate_limited(response):
                     error_text = await response.text()
-                    print(f"❌ 403 Error: {error_text}")
+                    logger.warning("❌ %s Error: %s", response.status, error_text)
                     raise Exception(f"GitHub API rate limit exceeded: {error_text}")
                 elif response.status == 422:
                     error_text = await response.text()
-                    print(f"❌ 422 Error: {error_text}")
+                    logger.warning("❌ 422 Error: %s", error_text)
                     raise Exception(f"Invalid search query: {error_text}")
                 else:
                     error_text = await response.text()
-                    print(f"❌ {response.status} Error: {error_text}")
-                    raise Exception(f"GitHub API error {response.status}: {error_text}")
+                    logger.warning("❌ %s Error: %s", response.status, error_text)
+                    raise Exception(
+                        f"GitHub API error {response.status}: {error_text}"
+                    )
+
+            # Sleep outside the semaphore so other requests can proceed
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_rate_limited(response: aiohttp.ClientResponse) -> bool:
+        """
+        Tell a rate-limit response from other errors.
+
+        GitHub also answers 403 for permission and abuse errors, which
+        retrying cannot fix; only those carrying Retry-After or an exhausted
+        quota are rate limits.
+        """
+        if response.status == 429:
+            return True
+        return response.status == 403 and (
+            "Retry-After" in response.headers
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+
+    def _get_retry_delay(
+        self, response: aiohttp.ClientResponse, attempt: int
+    ) -> Optional[float]:
+        """
+        Get how long to wait before retrying a rate-limited request.
+
+        Uses Retry-After for secondary limits, the X-RateLimit-Reset epoch
+        when the primary quota is exhausted, and exponential backoff
+        otherwise. Returns None if the wait would exceed GITHUB_MAX_RETRY_WAIT.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            delay = float(retry_after)
+        elif self._rl["remaining"] == 0:
+            delay = max(0.0, self._rl["reset"] - time.time())
+        else:
+            delay = float(2**attempt)
+
+        return delay if delay <= GITHUB_MAX_RETRY_WAIT else None
 
     async def _format_results(
         self, items: List[Dict[str, Any]], search_type: str
     ) -> List[GitHubSearchResult]:
         """Format GitHub API results into standardized format."""
+        formatter = self._formatters.get(search_type, self._format_generic)
         formatted_results = []
 
         for item in items:
             try:
-                if search_type == "code":
-                    result = GitHubSearchResult(
-                        title=item.get("name", "Unknown file"),
-                        url=item.get("html_url", ""),
-                        description=f"Code from {item.get('repository', {}).get('full_name', 'Unknown repo')}",
-                        score=item.get("score", 0.0),
-                        repository=item.get("repository", {}).get("full_name"),
-                        language=item.get("repository", {}).get("language"),
-                        metadata={
-                            "path": item.get("path", ""),
-                            "sha": item.get("sha", ""),
-                            "git_url": item.get("git_url", ""),
-                            "repository_url": item.get("repository", {}).get(
-                                "html_url", ""
-                            ),
-                        },
-                    )
-
-                elif search_type == "repositories":
-                    result = GitHubSearchResult(
-                        title=item.get("full_name", "Unknown repository"),
-                        url=item.get("html_url", ""),
-                        description=item.get("description", "No description available"),
-                        score=item.get("score", 0.0),
-                        repository=item.get("full_name"),
-                        language=item.get("language"),
-                        created_at=item.get("created_at"),
-                        updated_at=item.get("updated_at"),
-                        metadata={
-                            "stars": item.get("stargazers_count", 0),
-                            "forks": item.get("forks_count", 0),
-                            "watchers": item.get("watchers_count", 0),
-                            "open_issues": item.get("open_issues_count", 0),
-                            "default_branch": item.get("default_branch", "main"),
-                            "topics": item.get("topics", []),
-                        },
-                    )
+                formatted_results.append(formatter(item))
+            except Exception as e:
+                # Skip malformed results
+                continue
 
-                elif search_type == "issues":
-                    result = GitHubSearchResult(
-                        title=item.get("title", "Unknown issue"),
-                        url=item.get("html_url", ""),
-                        description=item.get("body", "No description available")[:200]
-                        + "..."
-                        if item.get("body")
-                        else "No description",
-                        score=item.get("score", 0.0),
-                        repository=item.get("repository_url", "").split("/")[-2:]
-                        if item.get("repository_url")
-                        else None,
-                        created_at=item.get("created_at"),
-                        updated_at=item.get("updated_at"),
-                        metadata={
-                            "number": item.get("number"),
-                            "state": item.get("state"),
-                            "user": item.get("user", {}).get("login"),
-                            "labels": [
-                                label.get("name") for label in item.get("labels", [])
-                            ],
-                            "comments": item.get("comments", 0),
-                        },
-                    )
+        return formatted_results
 
-                elif search_type == "users":
-                    result = GitHubSearchResult(
-                        title=item.get("login", "Unknown user"),
-                        url=item.get("html_url", ""),
-                        description=item.get("bio", "No bio available"),
-                        score=item.get("score", 0.0),
-                        metadata={
-                            "type": item.get("type"),
-                            "public_repos": item.get("public_repos", 0),
-                            "followers": item.get("followers", 0),
-                            "following": item.get("following", 0),
-                            "avatar_url": item.get("avatar_url", ""),
-                        },
-                    )
+    @staticmethod
+    def _format_code(item: Dict[str, Any]) -> GitHubSearchResult:
+        """Format a code search hit."""
+        repository = item.get("repository", {})
+        return GitHubSearchResult(
+            title=item.get("name", "Unknown file"),
+            url=item.get("html_url", ""),
+            description=f"Code from {repository.get('full_name', 'Unknown repo')}",
+            score=item.get("score", 0.0),
+            repository=repository.get("full_name"),
+            language=repository.get("language"),
+            metadata={
+                "path": item.get("path", ""),
+                "sha": item.get("sha", ""),
+                "git_url": item.get("git_url", ""),
+                "repository_url": repository.get("html_url", ""),
+            },
+        )
 
-                else:
-                    # Generic format for other search types
-                    result = GitHubSearchResult(
-                        title=item.get("name", item.get("title", "Unknown")),
-                        url=item.get("html_url", ""),
-                        description=item.get(
-                            "description", item.get("body", "No description")
-                        )[:200],
-                        score=item.get("score", 0.0),
-                        metadata=item,
-                    )
+    @staticmethod
+    def _format_repo(item: Dict[str, Any]) -> GitHubSearchResult:
+        """Format a repository search hit."""
+        return GitHubSearchResult(
+            title=item.get("full_name", "Unknown repository"),
+            url=item.get("html_url", ""),
+            description=item.get("description", "No description available"),
+            score=item.get("score", 0.0),
+            repository=item.get("full_name"),
+            language=item.get("language"),
+            created_at=item.get("created_at"),
+            updated_at=item.get("updated_at"),
+            metadata={
+                "stars": item.get("stargazers_count", 0),
+                "forks": item.get("forks_count", 0),
+                "watchers": item.get("watchers_count", 0),
+                "open_issues": item.get("open_issues_count", 0),
+                "default_branch": item.get("default_branch", "main"),
+                "topics": item.get("topics", []),
+            },
+        )
 
-                formatted_results.append(result)
+    @staticmethod
+    def _format_issue(item: Dict[str, Any]) -> GitHubSearchResult:
+        """Format an issue search hit."""
+        body = item.get("body")
+        repository_url = item.get("repository_url")
+        return GitHubSearchResult(
+            title=item.get("title", "Unknown issue"),
+            url=item.get("html_url", ""),
+            description=body[:200] + "..." if body else "No description",
+            score=item.get("score", 0.0),
+            repository=(
+                "/".join(repository_url.split("/")[-2:]) if repository_url else None
+            ),
+            created_at=item.get("created_at"),
+            updated_at=item.get("updated_at"),
+            metadata={
+                "number": item.get("number"),
+                "state": item.get("state"),
+                "user": item.get("user", {}).get("login"),
+                "labels": [label.get("name") for label in item.get("labels", [])],
+                "comments": item.get("comments", 0),
+            },
+        )
 
-            except Exception as e:
-                # Skip malformed results
-                continue
+    @staticmethod
+    def _format_user(item: Dict[str, Any]) -> GitHubSearchResult:
+        """Format a user search hit."""
+        return GitHubSearchResult(
+            title=item.get("login", "Unknown user"),
+            url=item.get("html_url", ""),
+            description=item.get("bio", "No bio available"),
+            score=item.get("score", 0.0),
+            metadata={
+                "type": item.get("type"),
+                "public_repos": item.get("public_repos", 0),
+                "followers": item.get("followers", 0),
+                "following": item.get("following", 0),
+                "avatar_url": item.get("avatar_url", ""),
+            },
+        )
 
-        return formatted_results
+    @staticmethod
+    def _format_generic(item: Dict[str, Any]) -> GitHubSearchResult:
+        """Generic format for other search types."""
+        return GitHubSearchResult(
+            title=item.get("name", item.get("title", "Unknown")),
+            url=item.get("html_url", ""),
+            description=item.get("description", item.get("body", "No description"))[
+                :200
+            ],
+            score=item.get("score", 0.0),
+            metadata=item,
+        )
 
     def _get_parameters_schema(self) -> Dict[str, Any]:
         """Get parameters schema for GitHub search."""
@@ -746,110 +1115,19 @@ class GitHubCodeSearchTool(GitHubSearchTool):
 
         # Simplify query by extracting key terms
         # Remove unnecessary words and focus on the actual search intent
-        import re
-
-        # Extract meaningful keywords from the query
-        # Remove common question words and phrases
-        stop_words = {
-            "can",
-            "you",
-            "looking",
-            "for",
-            "the",
-            "github",
-            "about",
-            "and",
-            "tell",
-            "me",
-            "how",
-            "many",
-            "results",
-            "have",
-            "got",
-            "search",
-            "find",
-            "show",
-            "get",
-            "please",
-            "help",
-            "what",
-            "where",
-            "when",
-            "why",
-            "who",
-            "which",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "do",
-            "does",
-            "did",
-            "will",
-            "would",
-            "could",
-            "should",
-            "may",
-            "might",
-            "must",
-            "shall",
-            "to",
-            "of",
-            "in",
-            "on",
-            "at",
-            "by",
-            "from",
-            "with",
-            "without",
-            "through",
-            "during",
-            "before",
-            "after",
-            "above",
-            "below",
-            "up",
-            "down",
-            "out",
-            "off",
-            "over",
-            "under",
-            "again",
-            "further",
-            "then",
-            "once",
-            "a",
-            "an",
-            "as",
-            "so",
-            "than",
-            "too",
-            "very",
-            "just",
-            "now",
-            "here",
-            "there",
-            "where",
-            "this",
-            "that",
-            "these",
-            "those",
-        }
-
         # Clean and extract keywords
-        words = re.findall(r"\b\w+\b", query.lower())
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
+        words = _WORD_RE.findall(query.lower())
+        keywords = [word for word in words if word not in STOP_WORDS and len(word) > 2]
 
         # If we have meaningful keywords, use them; otherwise use the original query
         if keywords:
             # Take the most meaningful keywords (limit to avoid overly complex queries)
             query = " ".join(keywords[:3])
 
-        print(
-            f"🔍 Simplified search query: '{query}' (from original: '{kwargs.get('original_query', query)}')"
+        logger.debug(
+            "🔍 Simplified search query: '%s' (from original: '%s')",
+            query,
+            kwargs.get("original_query", query),
         )
 
         return await super().execute(
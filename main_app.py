@@ -16,25 +16,36 @@ Key Components:
 - CLI and Web interfaces
 """
 
-import os
 import sys
+import time
 import asyncio
-import tempfile
+import threading
+import hashlib
+from collections import OrderedDict, deque
+from itertools import islice
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-import json
 
 from config import get_config
 from document_processor import DocumentProcessor
 from vector_store import create_vector_store, create_retriever
 from llm_integration import (
+    SemanticResponseCache,
     create_llm_manager,
     create_conversation_manager,
     create_rag_chain,
 )
 from agent_core import create_agent, AgentWorkflow
 
+# Cosine similarity for answering a paraphrased message from the answer
+# cache; stricter than the RAG cache since answers may include tool output
+ANSWER_CACHE_THRESHOLD = 0.95
+
+# Seconds an assembled application status is reused; bounds staleness of
+# fields, like uptime, that change without new documents or messages
+STATUS_CACHE_TTL = 0.1
+
 
 class DocumentManager:
     """Manages document upload, processing, and indexing."""
@@ -50,6 +61,11 @@ class DocumentManager:
             "total_chunks": 0,
             "last_updated": None,
         }
+        # Bumped whenever documents are indexed, retiring cached answers
+        self.corpus_version = 0
+        # Ingestion runs in worker threads; guards the tracking state above
+        self._stats_lock = threading.Lock()
+        self._retriever = None
 
     def add_document_from_file(self, file_path: str) -> Dict[str, Any]:
         """Add a document from file path."""
@@ -59,7 +75,7 @@ class DocumentManager:
                 return {"success": False, "error": f"File not found: {file_path}"}
 
             # Process document
-            chunks = self.processor.process_file(str(file_path))
+            chunks = self.processor.process_document(file_path)["chunks"]
 
             if not chunks:
                 return {
@@ -68,28 +84,13 @@ class DocumentManager:
                 }
 
             # Add to vector store
-            self.vector_store.add_documents(chunks)
-
-            # Update tracking
-            self.processed_documents.append(
-                {
-                    "filename": file_path.name,
-                    "path": str(file_path),
-                    "chunks": len(chunks),
-                    "processed_at": datetime.now().isoformat(),
+            if not self.add_documents_batched(chunks):
+                return {
+                    "success": False,
+                    "error": f"Failed to index {file_path.name}",
                 }
-            )
 
-            self.document_stats["total_documents"] += 1
-            self.document_stats["total_chunks"] += len(chunks)
-            self.document_stats["last_updated"] = datetime.now().isoformat()
-
-            return {
-                "success": True,
-                "filename": file_path.name,
-                "chunks_added": len(chunks),
-                "total_chunks": self.document_stats["total_chunks"],
-            }
+            return self.record_document(file_path.name, str(file_path), len(chunks))
 
         except Exception as e:
             return {
@@ -97,39 +98,89 @@ class DocumentManager:
                 "error": f"Failed to process {file_path}: {str(e)}",
             }
 
+    def add_documents_batched(
+        self, chunks: List[Any], batch_size: Optional[int] = None
+    ) -> bool:
+        """
+        Embed and index chunks in batches of `batch_size`.
+
+        Each batch is one embedding request and one index write; batches
+        keep request payloads bounded when a whole directory is indexed.
+        """
+        return self.add_documents_until_failure(chunks, batch_size) == len(chunks)
+
+    def add_documents_until_failure(
+        self, chunks: List[Any], batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Index chunks in batches, stopping at the first failed batch.
+
+        Returns how many leading chunks were indexed, so callers that mix
+        several documents in one call can tell which were fully written.
+        """
+        batch_size = batch_size or self.config.vector_store.ingest_batch_size
+        for start in range(0, len(chunks), batch_size):
+            if not self.vector_store.add_documents(chunks[start : start + batch_size]):
+                return start
+        return len(chunks)
+
+    def record_document(
+        self, filename: str, path: Optional[str], chunk_count: int
+    ) -> Dict[str, Any]:
+        """Track an indexed document and return its success result."""
+        now = datetime.now().isoformat()
+        with self._stats_lock:
+            self.processed_documents.append(
+                {
+                    "filename": filename,
+                    "path": path,
+                    "chunks": chunk_count,
+                    "processed_at": now,
+                }
+            )
+
+            self.document_stats["total_documents"] += 1
+            self.document_stats["total_chunks"] += chunk_count
+            self.document_stats["last_updated"] = now
+            self.corpus_version += 1
+            total_chunks = self.document_stats["total_chunks"]
+
+        return {
+            "success": True,
+            "filename": filename,
+            "chunks_added": chunk_count,
+            "total_chunks": total_chunks,
+        }
+
     def add_document_from_text(
         self, text: str, title: str = "User Text"
     ) -> Dict[str, Any]:
         """Add a document from raw text."""
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".txt", delete=False
-            ) as f:
-                f.write(text)
-                temp_path = f.name
+            chunks = self.processor.process_text(text, title)
 
-            # Process the temporary file
-            result = self.add_document_from_file(temp_path)
-
-            # Clean up
-            os.unlink(temp_path)
-
-            if result["success"]:
-                result["filename"] = title
-                # Update the tracking info
-                if self.processed_documents:
-                    self.processed_documents[-1]["filename"] = title
+            if not self.add_documents_batched(chunks):
+                return {"success": False, "error": f"Failed to index {title}"}
 
-            return result
+            return self.record_document(title, None, len(chunks))
 
         except Exception as e:
             return {"success": False, "error": f"Failed to process text: {str(e)}"}
 
     def add_documents_from_directory(
-        self, directory_path: str, file_extensions: List[str] = None
+        self,
+        directory_path: str,
+        file_extensions: List[str] = None,
+        recursive: bool = False,
     ) -> Dict[str, Any]:
-        """Add all documents from a directory."""
+        """
+        Add all documents from a directory, and its subdirectories if recursive.
+
+        Files are listed with os.scandir and parsed in parallel worker
+        processes. Chunks are embedded and indexed in batches as parsed files
+        arrive, so the provider round-trips overlap with parsing of the
+        remaining files.
+        """
         if file_extensions is None:
             file_extensions = [".txt", ".md", ".pdf", ".docx"]
 
@@ -137,25 +188,66 @@ class DocumentManager:
         if not directory_path.exists():
             return {"success": False, "error": f"Directory not found: {directory_path}"}
 
+        batch_size = self.config.vector_store.ingest_batch_size
         results = []
-        success_count = 0
-        error_count = 0
-
-        for file_path in directory_path.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in file_extensions:
-                result = self.add_document_from_file(str(file_path))
-                results.append({"filename": file_path.name, "result": result})
+        pending = []  # (file_path, chunks) parsed but not yet indexed
 
-                if result["success"]:
-                    success_count += 1
+        def flush():
+            indexed = self.add_documents_until_failure(
+                [chunk for _, chunks in pending for chunk in chunks]
+            )
+            # Batches span files, so only files whose last chunk landed
+            # before the failed batch were fully written
+            end = 0
+            for file_path, chunks in pending:
+                start, end = end, end + len(chunks)
+                if end <= indexed:
+                    result = self.record_document(
+                        file_path.name, str(file_path), len(chunks)
+                    )
+                elif start < indexed:
+                    result = {
+                        "success": False,
+                        "error": f"Partially indexed {file_path.name}: "
+                        f"{indexed - start} of {len(chunks)} chunks written",
+                    }
                 else:
-                    error_count += 1
+                    result = {
+                        "success": False,
+                        "error": f"Failed to index {file_path.name}",
+                    }
+                results.append({"filename": file_path.name, "result": result})
+            pending.clear()
+
+        # Worker processes keep parsing while a batch is being embedded
+        for processed in self.processor.iter_process_directory(
+            directory_path,
+            recursive=recursive,
+            max_workers=self.config.vector_store.ingest_max_workers or None,
+            extensions=file_extensions,
+        ):
+            if processed["status"] == "success":
+                file_path = Path(processed["metadata"].filepath)
+                pending.append((file_path, processed["chunks"]))
+                if sum(len(chunks) for _, chunks in pending) >= batch_size:
+                    flush()
+            else:
+                file_path = Path(processed["filepath"])
+                error = f"Failed to process {file_path}: {processed['error']}"
+                results.append(
+                    {
+                        "filename": file_path.name,
+                        "result": {"success": False, "error": error},
+                    }
+                )
+        flush()
 
+        success_count = sum(1 for r in results if r["result"]["success"])
         return {
             "success": success_count > 0,
             "total_files": len(results),
             "successful": success_count,
-            "failed": error_count,
+            "failed": len(results) - success_count,
             "results": results,
             "total_chunks_added": sum(
                 r["result"].get("chunks_added", 0)
@@ -166,41 +258,178 @@ class DocumentManager:
 
     def get_document_stats(self) -> Dict[str, Any]:
         """Get document statistics."""
-        return {**self.document_stats, "processed_documents": self.processed_documents}
+        with self._stats_lock:
+            return {
+                **self.document_stats,
+                "processed_documents": list(self.processed_documents),
+            }
 
-    def search_documents(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+    @property
+    def retriever(self):
+        """Retriever over this manager's vector store, built on first use."""
+        if self._retriever is None:
+            self._retriever = create_retriever(self.vector_store, self.config)
+        return self._retriever
+
+    def search_documents(
+        self, query: str, k: int = 5, recall_hint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """Search documents using the vector store."""
         try:
-            retriever = create_retriever(self.vector_store, self.config)
-            results = retriever.retrieve_documents(query, k=k)
-
-            return [
-                {
-                    "content": result.chunk.content,
-                    "score": result.score,
-                    "source": result.chunk.source_document,
-                    "chunk_index": result.chunk.chunk_index,
-                }
-                for result in results
-            ]
+            results = self.retriever.retrieve_documents(
+                query, k=k, recall_hint=recall_hint
+            )
+            return self._format_search_results(results)
         except Exception as e:
             return []
 
+    async def search_documents_batch(
+        self, queries: List[str], k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search documents for several queries.
+
+        The queries are embedded in one batched provider call and searched
+        in a worker thread, off the event loop.
+        """
+        try:
+            batches = await asyncio.to_thread(
+                self.retriever.retrieve_documents_batch, queries, k
+            )
+        except Exception as e:
+            return [[] for _ in queries]
+        return [self._format_search_results(results) for results in batches]
+
+    @staticmethod
+    def _format_search_results(results) -> List[Dict[str, Any]]:
+        """Flatten search results into plain dictionaries."""
+        return [
+            {
+                "content": result.chunk.content,
+                "score": result.score,
+                "source": result.chunk.source_document,
+                "chunk_index": result.chunk.chunk_index,
+            }
+            for result in results
+        ]
+
+
+class AnswerCache:
+    """
+    Cache of answers to repeated and paraphrased opening messages.
+
+    Exact repeats, after trimming and lower-casing, are found by hash without
+    embedding the message; other messages are matched by embedding similarity.
+    Keys include the document manager's corpus version, so indexing new
+    documents retires every earlier answer. Only the first turn of a
+    conversation is looked up or stored, since later turns depend on history,
+    and answers built from tool calls (e.g. live GitHub searches) are never
+    stored.
+    """
+
+    def __init__(
+        self,
+        document_manager: DocumentManager,
+        max_entries: int = 256,
+        ttl: int = 3600,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+    ):
+        self.document_manager = document_manager
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._exact: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._semantic = SemanticResponseCache(max_entries, threshold, ttl)
+
+    def _key(self, message: str, workflow: Optional[str]) -> Tuple[tuple, str]:
+        """Return the semantic cache key and exact-match hash for a message."""
+        key = (workflow, self.document_manager.corpus_version)
+        digest = hashlib.sha256(
+            repr((message.strip().lower(), key)).encode("utf-8")
+        ).hexdigest()
+        return key, digest
+
+    async def _embed(self, message: str) -> Optional[List[float]]:
+        """Embed a message, or return None if no embedding is available."""
+        embedding_manager = self.document_manager.vector_store.embedding_manager
+        try:
+            result = await asyncio.to_thread(
+                embedding_manager.generate_embedding, message
+            )
+        except ValueError:
+            return None
+        return result.embedding
+
+    async def get(
+        self, message: str, workflow: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+        """
+        Look up the answer to a message.
+
+        Returns the cached result, if any, and the message embedding computed
+        on an exact-match miss so `put` can reuse it.
+        """
+        key, digest = self._key(message, workflow)
+        entry = self._exact.get(digest)
+        if entry is not None:
+            expires, result = entry
+            if expires > time.time():
+                self._exact.move_to_end(digest)
+                return result, None
+            del self._exact[digest]
+
+        embedding = await self._embed(message)
+        if embedding is None:
+            return None, None
+        return self._semantic.lookup(embedding, key), embedding
+
+    def put(
+        self,
+        message: str,
+        result: Dict[str, Any],
+        workflow: Optional[str] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> None:
+        """Cache the answer to a message, unless it came from tool calls."""
+        if result.get("tools_used"):
+            return
+        key, digest = self._key(message, workflow)
+        self._exact[digest] = (time.time() + self.ttl, result)
+        self._exact.move_to_end(digest)
+        if len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+        if embedding is not None:
+            self._semantic.store(embedding, key, result)
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        self._exact.clear()
+        self._semantic.clear()
+
 
 class ConversationInterface:
     """Manages user conversations and interactions."""
 
-    def __init__(self, agent, workflow_manager):
+    def __init__(
+        self,
+        agent,
+        workflow_manager,
+        answer_cache: Optional[AnswerCache] = None,
+        max_history: int = 1000,
+    ):
         """Initialize conversation interface."""
         self.agent = agent
         self.workflow_manager = workflow_manager
-        self.conversation_history = []
+        self.answer_cache = answer_cache
+        # Only the most recent entries are kept; older ones drop off
+        self.conversation_history = deque(maxlen=max_history)
         self.current_conversation_id = None
 
     async def start_new_conversation(self) -> str:
         """Start a new conversation."""
         self.current_conversation_id = self.agent.conversation_id
-        self.conversation_history = []
+        self.conversation_history.clear()
+        if self.answer_cache:
+            self.answer_cache.clear()
         return self.current_conversation_id
 
     async def send_message(
@@ -208,6 +437,9 @@ class ConversationInterface:
     ) -> Dict[str, Any]:
         """Send a message and get response."""
         try:
+            # Only an opening message is independent of conversation history
+            use_cache = self.answer_cache is not None and not self.conversation_history
+
             # Record user message
             self.conversation_history.append(
                 {
@@ -217,13 +449,27 @@ class ConversationInterface:
                 }
             )
 
-            # Process message
-            if use_workflow:
-                result = await self.workflow_manager.execute_workflow(
-                    use_workflow, message
-                )
+            # Repeated and paraphrased messages are answered from the cache
+            result = embedding = None
+            if use_cache:
+                result, embedding = await self.answer_cache.get(message, use_workflow)
+
+            if result is not None:
+                result = {**result, "cache_hit": True}
+                # Keep agent memory and the RAG conversation in step, as
+                # process_request would have
+                await self.agent.record_turn(message, result.get("response", ""))
             else:
-                result = await self.agent.process_request(message, use_tools=True)
+                # Process message
+                if use_workflow:
+                    result = await self.workflow_manager.execute_workflow(
+                        use_workflow, message
+                    )
+                else:
+                    result = await self.agent.process_request(message, use_tools=True)
+
+                if use_cache and result["success"]:
+                    self.answer_cache.put(message, result, use_workflow, embedding)
 
             # Record agent response
             if result["success"]:
@@ -240,17 +486,18 @@ class ConversationInterface:
             return result
 
         except Exception as e:
+            now = datetime.now().isoformat()
             error_result = {
                 "success": False,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now,
             }
 
             self.conversation_history.append(
                 {
                     "role": "error",
                     "content": str(e),
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now,
                 }
             )
 
@@ -258,14 +505,15 @@ class ConversationInterface:
 
     def get_conversation_history(self, limit: int = None) -> List[Dict[str, Any]]:
         """Get conversation history."""
-        if limit:
-            return self.conversation_history[-limit:]
-        return self.conversation_history
+        start = len(self.conversation_history) - limit if limit else 0
+        return list(islice(self.conversation_history, max(0, start), None))
 
     def clear_conversation(self):
         """Clear current conversation."""
-        self.conversation_history = []
+        self.conversation_history.clear()
         self.agent.clear_memory()
+        if self.answer_cache:
+            self.answer_cache.clear()
 
     def get_available_workflows(self) -> List[str]:
         """Get available workflows."""
@@ -283,6 +531,7 @@ class RAGApplication:
         self.agent = None
         self.workflow_manager = None
         self.is_initialized = False
+        self._status_cache: Optional[Tuple[tuple, float, Dict[str, Any]]] = None
 
     async def initialize(self) -> Dict[str, Any]:
         """Initialize all application components."""
@@ -321,8 +570,18 @@ class RAGApplication:
 
             # Initialize conversation interface
             print("💬 Setting up conversation interface...")
+            answer_cache = None
+            if self.config.llm.semantic_cache_size:
+                answer_cache = AnswerCache(
+                    self.document_manager,
+                    max_entries=self.config.llm.semantic_cache_size,
+                    ttl=self.config.llm.semantic_cache_ttl,
+                )
             self.conversation_interface = ConversationInterface(
-                self.agent, self.workflow_manager
+                self.agent,
+                self.workflow_manager,
+                answer_cache,
+                max_history=self.config.agent.max_history,
             )
 
             self.is_initialized = True
@@ -351,13 +610,25 @@ class RAGApplication:
         if not self.is_initialized:
             return {"initialized": False, "message": "Application not initialized"}
 
-        return {
+        # Reused while no documents or messages were added, for tight polling
+        key = (
+            self.document_manager.corpus_version,
+            len(self.agent.memory.short_term_memory),
+        )
+        if self._status_cache is not None:
+            cached_key, expires, status = self._status_cache
+            if cached_key == key and expires > time.monotonic():
+                return dict(status)
+
+        status = {
             "initialized": True,
             "document_stats": self.document_manager.get_document_stats(),
             "agent_status": self.agent.get_agent_status(),
             "available_workflows": self.conversation_interface.get_available_workflows(),
             "memory_summary": self.agent.get_memory_summary(),
         }
+        self._status_cache = (key, time.monotonic() + STATUS_CACHE_TTL, status)
+        return dict(status)
 
     async def add_document(
         self, source: str, source_type: str = "file"
@@ -367,14 +638,17 @@ class RAGApplication:
             return {"success": False, "error": "Application not initialized"}
 
         if source_type == "file":
-            return self.document_manager.add_document_from_file(source)
+            add = self.document_manager.add_document_from_file
         elif source_type == "text":
-            return self.document_manager.add_document_from_text(source)
+            add = self.document_manager.add_document_from_text
         elif source_type == "directory":
-            return self.document_manager.add_documents_from_directory(source)
+            add = self.document_manager.add_documents_from_directory
         else:
             return {"success": False, "error": f"Unknown source type: {source_type}"}
 
+        # Reading, parsing and embedding block; keep them off the event loop
+        return await asyncio.to_thread(add, source)
+
     async def chat(self, message: str, workflow: str = None) -> Dict[str, Any]:
         """Send a chat message."""
         if not self.is_initialized:
@@ -389,6 +663,15 @@ class RAGApplication:
 
         return self.document_manager.search_documents(query, k)
 
+    async def search_documents_batch(
+        self, queries: List[str], k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """Search documents for several queries."""
+        if not self.is_initialized:
+            return [[] for _ in queries]
+
+        return await self.document_manager.search_documents_batch(queries, k)
+
     def get_conversation_history(self, limit: int = None) -> List[Dict[str, Any]]:
         """Get conversation history."""
         if not self.is_initialized:
@@ -408,7 +691,8 @@ class RAGApplication:
         if self.is_initialized:
             # Save conversation history if needed
             # Clean up resources
-            pass
+            await asyncio.to_thread(self.document_manager.vector_store.save)
+            await self.agent.aclose()
 
         print("✅ Application shutdown complete")
 
@@ -464,6 +748,152 @@ def display_help():
     print("─" * 40)
 
 
+# CLI command handlers, each called with the application and the text
+# after the command word
+async def _cmd_help(app: RAGApplication, args: str) -> None:
+    display_help()
+
+
+async def _cmd_status(app: RAGApplication, args: str) -> None:
+    status = app.get_application_status()
+    print(f"\n📊 Application Status:")
+    print(f"  📄 Documents: {status['document_stats']['total_documents']}")
+    print(f"  📝 Chunks: {status['document_stats']['total_chunks']}")
+    print(f"  🧠 Memory items: {status['memory_summary']['short_term_items']}")
+    print(f"  🛠️  Available tools: {len(status['agent_status']['tools'])}")
+
+
+async def _cmd_workflows(app: RAGApplication, args: str) -> None:
+    workflows = app.conversation_interface.get_available_workflows()
+    print(f"\n🌊 Available Workflows: {', '.join(workflows)}")
+
+
+async def _cmd_tools(app: RAGApplication, args: str) -> None:
+    tools = app.agent.tool_manager.list_tools()
+    print(f"\n🛠️  Available Tools:")
+    for tool in tools:
+        print(f"  • {tool['name']}: {tool['description']}")
+
+
+async def _cmd_add(app: RAGApplication, args: str) -> None:
+    result = await app.add_document(args, "file")
+    if result["success"]:
+        print(f"✅ Added {result['filename']}: {result['chunks_added']} chunks")
+    else:
+        print(f"❌ Error: {result['error']}")
+
+
+async def _cmd_add_text(app: RAGApplication, args: str) -> None:
+    result = await app.add_document(args, "text")
+    if result["success"]:
+        print(f"✅ Added text document: {result['chunks_added']} chunks")
+    else:
+        print(f"❌ Error: {result['error']}")
+
+
+async def _cmd_add_dir(app: RAGApplication, args: str) -> None:
+    result = await app.add_document(args, "directory")
+    if result["success"]:
+        print(f"✅ Added {result['successful']}/{result['total_files']} documents")
+        print(f"   Total chunks added: {result['total_chunks_added']}")
+    else:
+        print(f"❌ Error: {result['error']}")
+
+
+async def _cmd_search(app: RAGApplication, args: str) -> None:
+    results = app.search_documents(args, k=3)
+    if results:
+        print(f"\n🔍 Search Results for '{args}':")
+        for i, result in enumerate(results, 1):
+            print(f"\n{i}. Score: {result['score']:.3f}")
+            print(f"   Source: {result['source']}")
+            print(f"   Content: {result['content'][:200]}...")
+    else:
+        print("No results found.")
+
+
+async def _cmd_docs_stats(app: RAGApplication, args: str) -> None:
+    stats = app.document_manager.get_document_stats()
+    print(f"\n📊 Document Statistics:")
+    print(f"  📄 Total documents: {stats['total_documents']}")
+    print(f"  📝 Total chunks: {stats['total_chunks']}")
+    print(f"  🕒 Last updated: {stats['last_updated']}")
+
+
+async def _cmd_chat(app: RAGApplication, args: str) -> None:
+    print("\n🤖 Processing your message...")
+    result = await app.chat(args)
+    if result["success"]:
+        print(f"\n🤖 Assistant: {result['response']}")
+        if result.get("tools_used"):
+            print(f"🛠️  Tools used: {', '.join(result['tools_used'])}")
+    else:
+        print(f"❌ Error: {result['error']}")
+
+
+def _workflow_command(workflow: str, progress: str, label: str):
+    """Build a handler that runs a message through a workflow."""
+
+    async def handler(app: RAGApplication, args: str) -> None:
+        print(f"\n🤖 {progress}...")
+        result = await app.chat(args, workflow=workflow)
+        if result["success"]:
+            print(f"\n🤖 {label}: {result['response']}")
+        else:
+            print(f"❌ Error: {result['error']}")
+
+    return handler
+
+
+async def _cmd_history(app: RAGApplication, args: str) -> None:
+    limit = int(args) if args.isdigit() else None
+    history = app.get_conversation_history(limit)
+
+    if history:
+        print(f"\n📝 Conversation History:")
+        for entry in history[-10:]:  # Show last 10
+            role_icon = "👤" if entry["role"] == "user" else "🤖"
+            print(f"{role_icon} {entry['content'][:100]}...")
+    else:
+        print("No conversation history.")
+
+
+async def _cmd_clear(app: RAGApplication, args: str) -> None:
+    app.clear_conversation()
+    print("✅ Conversation cleared")
+
+
+# CLI commands by name; "quit" and "exit" are handled by the loop itself
+COMMANDS = {
+    "help": _cmd_help,
+    "status": _cmd_status,
+    "workflows": _cmd_workflows,
+    "tools": _cmd_tools,
+    "add": _cmd_add,
+    "add-text": _cmd_add_text,
+    "add-dir": _cmd_add_dir,
+    "search": _cmd_search,
+    "docs-stats": _cmd_docs_stats,
+    "chat": _cmd_chat,
+    "qa": _workflow_command(
+        "question_answering", "Processing your question", "Assistant"
+    ),
+    "analyze": _workflow_command(
+        "document_analysis", "Analyzing documents", "Analysis"
+    ),
+    "research": _workflow_command(
+        "research", "Conducting research", "Research Results"
+    ),
+    "history": _cmd_history,
+    "clear": _cmd_clear,
+}
+
+# Commands that do nothing without an argument
+COMMANDS_REQUIRING_ARGS = frozenset(
+    {"add", "add-text", "add-dir", "search", "chat", "qa", "analyze", "research"}
+)
+
+
 async def main():
     """Main application entry point."""
     try:
@@ -490,139 +920,21 @@ async def main():
                     continue
 
                 # Parse command
-                parts = user_input.split(" ", 1)
-                command = parts[0].lower()
-                args = parts[1] if len(parts) > 1 else ""
+                command, _, args = user_input.partition(" ")
+                command = command.lower()
 
                 # Handle commands
-                if command in ["quit", "exit"]:
+                if command in ("quit", "exit"):
                     break
 
-                elif command == "help":
-                    display_help()
-
-                elif command == "status":
-                    status = app.get_application_status()
-                    print(f"\n📊 Application Status:")
-                    print(
-                        f"  📄 Documents: {status['document_stats']['total_documents']}"
-                    )
-                    print(f"  📝 Chunks: {status['document_stats']['total_chunks']}")
-                    print(
-                        f"  🧠 Memory items: {status['memory_summary']['short_term_items']}"
-                    )
-                    print(
-                        f"  🛠️  Available tools: {len(status['agent_status']['tools'])}"
-                    )
-
-                elif command == "workflows":
-                    workflows = app.conversation_interface.get_available_workflows()
-                    print(f"\n🌊 Available Workflows: {', '.join(workflows)}")
-
-                elif command == "tools":
-                    tools = app.agent.tool_manager.list_tools()
-                    print(f"\n🛠️  Available Tools:")
-                    for tool in tools:
-                        print(f"  • {tool['name']}: {tool['description']}")
-
-                elif command == "add" and args:
-                    result = await app.add_document(args, "file")
-                    if result["success"]:
-                        print(
-                            f"✅ Added {result['filename']}: {result['chunks_added']} chunks"
-                        )
-                    else:
-                        print(f"❌ Error: {result['error']}")
-
-                elif command == "add-text" and args:
-                    result = await app.add_document(args, "text")
-                    if result["success"]:
-                        print(f"✅ Added text document: {result['chunks_added']} chunks")
-                    else:
-                        print(f"❌ Error: {result['error']}")
-
-                elif command == "add-dir" and args:
-                    result = await app.add_document(args, "directory")
-                    if result["success"]:
-                        print(
-                            f"✅ Added {result['successful']}/{result['total_files']} documents"
-                        )
-                        print(f"   Total chunks added: {result['total_chunks_added']}")
-                    else:
-                        print(f"❌ Error: {result['error']}")
-
-                elif command == "search" and args:
-                    results = app.search_documents(args, k=3)
-                    if results:
-                        print(f"\n🔍 Search Results for '{args}':")
-                        for i, result in enumerate(results, 1):
-                            print(f"\n{i}. Score: {result['score']:.3f}")
-                            print(f"   Source: {result['source']}")
-                            print(f"   Content: {result['content'][:200]}...")
-                    else:
-                        print("No results found.")
-
-                elif command == "docs-stats":
-                    stats = app.document_manager.get_document_stats()
-                    print(f"\n📊 Document Statistics:")
-                    print(f"  📄 Total documents: {stats['total_documents']}")
-                    print(f"  📝 Total chunks: {stats['total_chunks']}")
-                    print(f"  🕒 Last updated: {stats['last_updated']}")
-
-                elif command == "chat" and args:
-                    print("\n🤖 Processing your message...")
-                    result = await app.chat(args)
-                    if result["success"]:
-                        print(f"\n🤖 Assistant: {result['response']}")
-                        if result.get("tools_used"):
-                            print(f"🛠️  Tools used: {', '.join(result['tools_used'])}")
-                    else:
-                        print(f"❌ Error: {result['error']}")
-
-                elif command == "qa" and args:
-                    print("\n🤖 Processing your question...")
-                    result = await app.chat(args, workflow="question_answering")
-                    if result["success"]:
-                        print(f"\n🤖 Assistant: {result['response']}")
-                    else:
-                        print(f"❌ Error: {result['error']}")
-
-                elif command == "analyze" and args:
-                    print("\n🤖 Analyzing documents...")
-                    result = await app.chat(args, workflow="document_analysis")
-                    if result["success"]:
-                        print(f"\n🤖 Analysis: {result['response']}")
-                    else:
-                        print(f"❌ Error: {result['error']}")
-
-                elif command == "research" and args:
-                    print("\n🤖 Conducting research...")
-                    result = await app.chat(args, workflow="research")
-                    if result["success"]:
-                        print(f"\n🤖 Research Results: {result['response']}")
-                    else:
-                        print(f"❌ Error: {result['error']}")
-
-                elif command == "history":
-                    limit = int(args) if args.isdigit() else None
-                    history = app.get_conversation_history(limit)
-
-                    if history:
-                        print(f"\n📝 Conversation History:")
-                        for entry in history[-10:]:  # Show last 10
-                            role_icon = "👤" if entry["role"] == "user" else "🤖"
-                            print(f"{role_icon} {entry['content'][:100]}...")
-                    else:
-                        print("No conversation history.")
-
-                elif command == "clear":
-                    app.clear_conversation()
-                    print("✅ Conversation cleared")
-
-                else:
+                handler = COMMANDS.get(command)
+                if handler is None or (command in COMMANDS_REQUIRING_ARGS and not args):
                     print(
                         f"❌ Unknown command: '{command}'. Type 'help' for available commands."
                     )
+                    continue
+
+                await handler(app, args)
 
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye!")
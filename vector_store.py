@@ -2,16 +2,24 @@
 Vector Store Module for RAG System
 
 This module provides vector storage and retrieval capabilities for the RAG system.
-Supports ChromaDB for persistent storage and FAISS for high-performance similarity search.
+Supports ChromaDB for persistent storage, FAISS for high-performance similarity search,
+and a dependency-free NumPy in-memory store.
 """
 
 import os
 import json
-import uuid
+import time
+import pickle
+import hashlib
+import sqlite3
+import itertools
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple, Union
-from datetime import datetime
+from datetime import datetime, timezone
 
 import numpy as np
 from pydantic import BaseModel, Field, field_validator
@@ -39,9 +47,53 @@ try:
 except ImportError:
     HAS_OPENAI_EMBEDDINGS = False
 
+try:
+    import httpx
+
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    HAS_SENTENCE_TRANSFORMERS = False
+
 from config import get_config
 from document_processor import DocumentChunk, DocumentMetadata
 
+# Seconds to wait on an Ollama embedding request; a cold model load can
+# take most of this
+OLLAMA_TIMEOUT = 120.0
+
+# Chunks written to ChromaDB per collection.add call
+CHROMA_ADD_BATCH_SIZE = 1000
+
+# Number of vectors used to train quantized FAISS indexes
+FAISS_TRAINING_SAMPLE_SIZE = 10000
+
+# FAISS_QUANTIZATION values and the ScalarQuantizer types they map to; any
+# other value ("none", "fp32") keeps full-precision vectors
+FAISS_SCALAR_QUANTIZERS = {"fp16": "QT_fp16", "int8": "QT_8bit"}
+
+# Minimum seconds between FAISS index saves during ingestion; pending
+# writes are flushed by save() at shutdown
+FAISS_SAVE_INTERVAL = 30.0
+
+# Vectors an "ivfpq" FAISS store holds in a flat index before training its
+# IVF-PQ index; k-means needs ~39 points per list to converge
+FAISS_IVF_MIN_VECTORS = 10000
+FAISS_IVF_MAX_LISTS = 4096
+
+# Per-query FAISS tuning kwargs, ignored by the other backends
+FAISS_SEARCH_HINTS = ("recall_hint", "ef_search", "nprobe")
+
+# PQ candidates re-ranked against 8-bit codes per requested result; PQ
+# distances alone recall well under half of the true neighbours
+FAISS_REFINE_K_FACTOR = 16
+
 
 class EmbeddingResult(BaseModel):
     """Result of embedding generation."""
@@ -74,21 +126,163 @@ class SearchResult(BaseModel):
         return v
 
 
+class EmbeddingCache:
+    """
+    Content-addressed embeddings persisted in SQLite.
+
+    Keys are SHA-256 digests of the embedding model and the text, so a model
+    change never returns stale vectors. Vectors are stored as float32 bytes.
+    """
+
+    # Keeps each lookup under SQLite's bound-parameter limit
+    QUERY_BATCH_SIZE = 500
+
+    def __init__(self, path: Union[str, Path]):
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(hash TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(model: str, text: str) -> str:
+        """Return the cache key of a text embedded with a model."""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, hashes: List[str]) -> Dict[str, List[float]]:
+        """Return the cached vectors among the given hashes."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), self.QUERY_BATCH_SIZE):
+                batch = hashes[start : start + self.QUERY_BATCH_SIZE]
+                rows = self._conn.execute(
+                    "SELECT hash, vector FROM embeddings WHERE hash IN "
+                    f"({','.join('?' * len(batch))})",
+                    batch,
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, hashes: List[str], vectors: List[List[float]]) -> None:
+        """Store vectors under their hashes."""
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in zip(hashes, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+
+class SentenceTransformerEmbeddings:
+    """On-device embeddings with the same interface as LangChain embeddings."""
+
+    def __init__(self, model_name: str):
+        self.model = SentenceTransformer(model_name)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.encode(text, normalize_embeddings=True).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts, normalize_embeddings=True).tolist()
+
+
+class OllamaEmbeddings:
+    """Ollama embeddings, sending a whole batch per /api/embed request."""
+
+    def __init__(self, model_name: str, base_url: str):
+        self.model = model_name
+        self.client = httpx.Client(base_url=base_url, timeout=OLLAMA_TIMEOUT)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        response = self.client.post(
+            "/api/embed", json={"model": self.model, "input": texts}
+        )
+        if response.status_code != 404:
+            response.raise_for_status()
+            embeddings = response.json().get("embeddings")
+            if embeddings:
+                return embeddings
+
+        # Servers before Ollama 0.3 only have the one-text endpoint
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        response = self.client.post(
+            "/api/embeddings", json={"model": self.model, "prompt": text}
+        )
+        response.raise_for_status()
+        return response.json()["embedding"]
+
+
 class EmbeddingManager:
-    """Manages embedding generation using OpenAI."""
+    """Manages embedding generation using OpenAI, Ollama or a local model."""
 
     def __init__(self, config=None):
         self.config = config or get_config()
         self.embeddings = None
+        self._embed_query = lru_cache(
+            maxsize=self.config.vector_store.query_embedding_cache_size
+        )(self._embed_query_uncached)
+        self.cache = self._open_cache()
         self._initialize_embeddings()
 
+    def _open_cache(self) -> Optional[EmbeddingCache]:
+        """Open the configured on-disk embedding cache, if any."""
+        path = self.config.vector_store.embedding_cache_path
+        if not path:
+            return None
+        try:
+            return EmbeddingCache(path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Could not open embedding cache at {path}: {e}")
+            return None
+
     def _initialize_embeddings(self):
-        """Initialize OpenAI embeddings."""
+        """Initialize the configured embedding provider."""
+        provider = self.config.vector_store.embedding_provider.lower()
+        if provider == "ollama":
+            if not HAS_HTTPX:
+                print("Warning: Ollama embeddings require httpx: pip install httpx")
+                return
+            self.embeddings = OllamaEmbeddings(
+                self.config.vector_store.embedding_model,
+                self.config.vector_store.ollama_base_url,
+            )
+            return
+
+        if provider == "local":
+            if not HAS_SENTENCE_TRANSFORMERS:
+                print(
+                    "Warning: Local embeddings require sentence-transformers: "
+                    "pip install sentence-transformers"
+                )
+                return
+            try:
+                self.embeddings = SentenceTransformerEmbeddings(
+                    self.config.vector_store.embedding_model
+                )
+            except Exception as e:
+                print(f"Warning: Could not initialize local embeddings: {e}")
+            return
+
         if HAS_OPENAI_EMBEDDINGS:
             try:
                 self.embeddings = OpenAIEmbeddings(
                     model=self.config.vector_store.embedding_model,
                     openai_api_key=os.getenv("OPENAI_API_KEY"),
+                    # Matryoshka truncation; None keeps the model's full size
+                    dimensions=self.config.vector_store.embedding_dimensions or None,
                 )
             except Exception as e:
                 print(f"Warning: Could not initialize OpenAI embeddings: {e}")
@@ -102,7 +296,8 @@ class EmbeddingManager:
             raise ValueError("No embedding provider available")
 
         try:
-            embedding = self.embeddings.embed_query(text.strip())
+            # Whitespace-only differences share one cache entry
+            embedding = list(self._embed_query(" ".join(text.split())))
             return EmbeddingResult(
                 embedding=embedding,
                 model=self.config.vector_store.embedding_model,
@@ -111,6 +306,42 @@ class EmbeddingManager:
         except Exception as e:
             raise ValueError(f"Failed to generate embedding: {e}")
 
+    def _embed_query_uncached(self, text: str) -> Tuple[float, ...]:
+        """Embed a query; wrapped in an LRU cache so repeat queries skip the provider."""
+        return tuple(self.embeddings.embed_query(text))
+
+    def generate_query_embeddings(self, queries: List[str]) -> List[EmbeddingResult]:
+        """
+        Embed several search queries in one provider call.
+
+        Queries are normalized like generate_embedding() and skip the on-disk
+        document cache, which would otherwise fill up with one-off queries.
+        """
+        if not queries:
+            return []
+
+        if not self.embeddings:
+            raise ValueError("No embedding provider available")
+
+        normalized = [" ".join(query.split()) for query in queries]
+        if not all(normalized):
+            raise ValueError("Text cannot be empty")
+
+        try:
+            # Repeated queries within the batch are embedded once
+            unique = list(dict.fromkeys(normalized))
+            vectors = dict(zip(unique, self._embed_uncached(unique)))
+            return [
+                EmbeddingResult(
+                    embedding=vectors[query],
+                    model=self.config.vector_store.embedding_model,
+                    dimensions=len(vectors[query]),
+                )
+                for query in normalized
+            ]
+        except Exception as e:
+            raise ValueError(f"Failed to generate query embeddings: {e}")
+
     def generate_embeddings_batch(self, texts: List[str]) -> List[EmbeddingResult]:
         """Generate embeddings for multiple texts."""
         if not texts:
@@ -120,7 +351,7 @@ class EmbeddingManager:
             raise ValueError("No embedding provider available")
 
         try:
-            embeddings = self.embeddings.embed_documents(texts)
+            embeddings = self._embed_documents(texts)
             return [
                 EmbeddingResult(
                     embedding=embedding,
@@ -132,6 +363,57 @@ class EmbeddingManager:
         except Exception as e:
             raise ValueError(f"Failed to generate batch embeddings: {e}")
 
+    def generate_embeddings_array(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into one (len(texts), dimension) float32 matrix for indexing."""
+        if not self.embeddings:
+            raise ValueError("No embedding provider available")
+
+        try:
+            return np.asarray(self._embed_documents(texts), dtype=np.float32)
+        except Exception as e:
+            raise ValueError(f"Failed to generate batch embeddings: {e}")
+
+    def _embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, sending only those missing from the cache to the provider."""
+        if self.cache is None:
+            return self._embed_uncached(texts)
+
+        store_config = self.config.vector_store
+        model = f"{store_config.embedding_provider}:{store_config.embedding_model}"
+        if store_config.embedding_dimensions:
+            model += f":{store_config.embedding_dimensions}"
+        hashes = [EmbeddingCache.content_hash(model, text) for text in texts]
+        vectors = self.cache.get_many(list(set(hashes)))
+
+        # Repeated texts within the batch are embedded once
+        missing = {
+            key: text for key, text in zip(hashes, texts) if key not in vectors
+        }
+        if missing:
+            embedded = self._embed_uncached(list(missing.values()))
+            self.cache.put_many(list(missing), embedded)
+            vectors.update(zip(missing, embedded))
+
+        return [vectors[key] for key in hashes]
+
+    def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the provider, sending API batches concurrently."""
+        store_config = self.config.vector_store
+        batch_size = store_config.embedding_batch_size
+        # Local models are CPU-bound, so only API requests gain from overlap
+        local = store_config.embedding_provider.lower() == "local"
+        if local or len(texts) <= batch_size:
+            return self.embeddings.embed_documents(texts)
+
+        batches = [
+            texts[start : start + batch_size]
+            for start in range(0, len(texts), batch_size)
+        ]
+        workers = min(store_config.embedding_max_concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self.embeddings.embed_documents, batches)
+            return [vector for batch in results for vector in batch]
+
 
 class VectorStore(ABC):
     """Abstract base class for vector stores."""
@@ -148,10 +430,50 @@ class VectorStore(ABC):
         pass
 
     @abstractmethod
-    def similarity_search(self, query: str, k: int = 5, **kwargs) -> List[SearchResult]:
-        """Perform similarity search for the query."""
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        query_embedding: Optional[List[float]] = None,
+        min_score: float = 0.0,
+        **kwargs,
+    ) -> List[SearchResult]:
+        """
+        Perform similarity search for the query.
+
+        Pass `query_embedding` when the caller has already embedded the query
+        to skip embedding it again. Hits scoring below `min_score` are dropped
+        before results are built.
+        """
         pass
 
+    def _embed_search_query(
+        self, query: str, query_embedding: Optional[List[float]]
+    ) -> List[float]:
+        """Return the precomputed query embedding, or generate one."""
+        if query_embedding is not None:
+            return query_embedding
+        return self.embedding_manager.generate_embedding(query.strip()).embedding
+
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        query_embeddings: List[List[float]],
+        k: int = 5,
+        min_score: float = 0.0,
+        **kwargs,
+    ) -> List[List[SearchResult]]:
+        """Search several already-embedded queries, one result list per query."""
+        return [
+            self.similarity_search(
+                query, k=k, query_embedding=embedding, min_score=min_score, **kwargs
+            )
+            for query, embedding in zip(queries, query_embeddings)
+        ]
+
+    def save(self) -> None:
+        """Persist pending writes; stores that write through need nothing."""
+
     @abstractmethod
     def delete_documents(self, document_ids: List[str]) -> bool:
         """Delete documents from the vector store."""
@@ -188,8 +510,18 @@ class ChromaVectorStore(VectorStore):
         )
 
         self.collection = self.client.get_or_create_collection(
-            name=collection_name, metadata={"description": "RAG document chunks"}
+            name=collection_name,
+            metadata={"description": "RAG document chunks", "hnsw:space": "cosine"},
         )
+        # Collections created before cosine was set keep Chroma's default
+        # squared-L2 space, which scores differently
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        self._squared_l2 = space == "l2"
+
+        # Chunk ids end in a random per-instance prefix plus a counter, which
+        # stays unique across restarts without a urandom read per chunk
+        self._id_prefix = os.urandom(4).hex()
+        self._id_counter = itertools.count()
 
     def add_documents(
         self, chunks: List[DocumentChunk], metadata: Optional[DocumentMetadata] = None
@@ -201,45 +533,53 @@ class ChromaVectorStore(VectorStore):
         try:
             # Generate embeddings
             texts = [chunk.content for chunk in chunks]
-            embedding_results = self.embedding_manager.generate_embeddings_batch(texts)
-
-            # Prepare data for ChromaDB
-            ids = []
-            embeddings = []
-            documents = []
-            metadatas = []
-
-            for chunk, embedding_result in zip(chunks, embedding_results):
-                chunk_id = f"{chunk.source_document}_{chunk.chunk_index}_{uuid.uuid4().hex[:8]}"
-                ids.append(chunk_id)
-                embeddings.append(embedding_result.embedding)
-                documents.append(chunk.content)
-
-                # Prepare metadata
-                chunk_metadata = {
-                    "chunk_id": chunk.chunk_id,
-                    "source_document": chunk.source_document,
-                    "chunk_index": chunk.chunk_index,
-                    "character_count": len(chunk.content),
-                    "added_at": datetime.now().isoformat(),
-                }
-
-                if metadata:
-                    chunk_metadata.update(
-                        {
-                            "document_type": metadata.document_type.value,
-                            "file_size": metadata.file_size,
-                            "file_hash": metadata.file_hash,
-                        }
+            embeddings = self.embedding_manager.generate_embeddings_array(texts)
+
+            # Write in fixed-size batches so one call never holds the whole
+            # ingest, and never exceeds the server's batch limit
+            batch_size = min(CHROMA_ADD_BATCH_SIZE, self._max_batch_size())
+            added_at = datetime.now(timezone.utc).isoformat()
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start : start + batch_size]
+                ids = []
+                documents = []
+                metadatas = []
+
+                for chunk in batch:
+                    chunk_id = (
+                        f"{chunk.source_document}_{chunk.chunk_index}_"
+                        f"{self._id_prefix}{next(self._id_counter):x}"
                     )
-
-                chunk_metadata.update(chunk.metadata)
-                metadatas.append(chunk_metadata)
-
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
-            )
+                    ids.append(chunk_id)
+                    documents.append(chunk.content)
+
+                    # Prepare metadata
+                    chunk_metadata = {
+                        "chunk_id": chunk.chunk_id,
+                        "source_document": chunk.source_document,
+                        "chunk_index": chunk.chunk_index,
+                        "character_count": len(chunk.content),
+                        "added_at": added_at,
+                    }
+
+                    if metadata:
+                        chunk_metadata.update(
+                            {
+                                "document_type": metadata.document_type.value,
+                                "file_size": metadata.file_size,
+                                "file_hash": metadata.file_hash,
+                            }
+                        )
+
+                    chunk_metadata.update(chunk.metadata)
+                    metadatas.append(chunk_metadata)
+
+                self.collection.add(
+                    ids=ids,
+                    embeddings=embeddings[start : start + batch_size],
+                    documents=documents,
+                    metadatas=metadatas,
+                )
 
             return True
 
@@ -247,16 +587,35 @@ class ChromaVectorStore(VectorStore):
             print(f"Error adding documents to ChromaDB: {e}")
             return False
 
-    def similarity_search(self, query: str, k: int = 5, **kwargs) -> List[SearchResult]:
+    def _max_batch_size(self) -> int:
+        """Largest add the Chroma client accepts in one call."""
+        try:
+            return self.client.get_max_batch_size()
+        except AttributeError:
+            # Clients before chromadb 0.4.10 do not report a limit
+            return CHROMA_ADD_BATCH_SIZE
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        query_embedding: Optional[List[float]] = None,
+        min_score: float = 0.0,
+        **kwargs,
+    ) -> List[SearchResult]:
         """Perform similarity search in ChromaDB."""
         if not query or not query.strip():
             return []
 
+        # Search hints for other backends are not ChromaDB query arguments
+        for hint in FAISS_SEARCH_HINTS:
+            kwargs.pop(hint, None)
+
         try:
-            query_embedding = self.embedding_manager.generate_embedding(query.strip())
+            query_embedding = self._embed_search_query(query, query_embedding)
 
             results = self.collection.query(
-                query_embeddings=[query_embedding.embedding],
+                query_embeddings=[query_embedding],
                 n_results=k,
                 include=["documents", "metadatas", "distances"],
                 **kwargs,
@@ -272,8 +631,13 @@ class ChromaVectorStore(VectorStore):
                 for rank, (doc, meta, distance) in enumerate(
                     zip(documents, metadatas, distances)
                 ):
-                    # Convert distance to similarity score
-                    score = max(0.0, min(1.0, 1.0 - distance))
+                    # Convert distance to cosine similarity: cosine distance is
+                    # 1 - cos, squared L2 between unit vectors is 2 - 2cos
+                    cosine_distance = distance / 2.0 if self._squared_l2 else distance
+                    score = max(0.0, min(1.0, 1.0 - cosine_distance))
+                    # Hits come back nearest first
+                    if score < min_score:
+                        break
 
                     chunk = DocumentChunk(
                         chunk_id=meta.get("chunk_id", f"unknown_{rank}"),
@@ -336,9 +700,94 @@ class FAISSVectorStore(VectorStore):
         self.index_path = Path(index_path)
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
         self.index = None
-        self.documents = []
         self.dimension = None
 
+        # OpenMP threads for multi-query search; containers often default to 1
+        faiss.omp_set_num_threads(
+            self.config.vector_store.faiss_threads or os.cpu_count() or 1
+        )
+
+        # Per-vector payloads, parallel to the FAISS ids; vectors live only
+        # in self.index
+        self.chunks: List[DocumentChunk] = []
+        self.metadata: List[Optional[DocumentMetadata]] = []
+        self.added_at: List[str] = []
+
+        self._mmapped = False
+        self._unsaved = False
+        self._last_save = time.monotonic()
+        if self._index_file.exists() and self._payload_file.exists():
+            self.load()
+
+    @property
+    def _index_file(self) -> Path:
+        return self.index_path.with_suffix(".faiss")
+
+    @property
+    def _payload_file(self) -> Path:
+        return self.index_path.with_suffix(".pkl")
+
+    def save(self) -> None:
+        """Write the index and chunk payloads next to `index_path`."""
+        if self.index is None or not self._unsaved:
+            return
+
+        # Write to temporary files first so a crash never leaves a torn pair
+        index_tmp = self._index_file.with_suffix(".faiss.tmp")
+        payload_tmp = self._payload_file.with_suffix(".pkl.tmp")
+        faiss.write_index(self.index, str(index_tmp))
+        with open(payload_tmp, "wb") as f:
+            pickle.dump(
+                {
+                    "dimension": self.dimension,
+                    "ntotal": self.index.ntotal,
+                    "chunks": self.chunks,
+                    "metadata": self.metadata,
+                    "added_at": self.added_at,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(index_tmp, self._index_file)
+        os.replace(payload_tmp, self._payload_file)
+
+        self._unsaved = False
+        self._last_save = time.monotonic()
+
+    def load(self) -> None:
+        """Read a saved index, memory-mapping it when `faiss_mmap` is set."""
+        try:
+            with open(self._payload_file, "rb") as f:
+                payload = pickle.load(f)
+
+            self._mmapped = self.config.vector_store.faiss_mmap
+            if self._mmapped:
+                self.index = faiss.read_index(
+                    str(self._index_file),
+                    faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY,
+                )
+            else:
+                self.index = faiss.read_index(str(self._index_file))
+
+            # The pair is replaced file by file, so a crash in between can
+            # leave an index and payload from different saves
+            ntotal = payload.get("ntotal", len(payload["chunks"]))
+            if ntotal != self.index.ntotal or ntotal != len(payload["chunks"]):
+                raise ValueError(
+                    f"index holds {self.index.ntotal} vectors but payload "
+                    f"expects {ntotal} for {len(payload['chunks'])} chunks"
+                )
+        except Exception as e:
+            print(f"Warning: Could not load FAISS index from {self._index_file}: {e}")
+            self.index = None
+            self._mmapped = False
+            return
+
+        self.dimension = payload["dimension"]
+        self.chunks = payload["chunks"]
+        self.metadata = payload["metadata"]
+        self.added_at = payload["added_at"]
+
     def add_documents(
         self, chunks: List[DocumentChunk], metadata: Optional[DocumentMetadata] = None
     ) -> bool:
@@ -349,30 +798,33 @@ class FAISSVectorStore(VectorStore):
         try:
             # Generate embeddings
             texts = [chunk.content for chunk in chunks]
-            embedding_results = self.embedding_manager.generate_embeddings_batch(texts)
-
-            # Convert to numpy array
-            embeddings = np.array(
-                [result.embedding for result in embedding_results], dtype=np.float32
-            )
+            embeddings = self.embedding_manager.generate_embeddings_array(texts)
+            # Unit vectors make inner product equal cosine similarity
+            faiss.normalize_L2(embeddings)
 
             # Initialize index if needed
             if self.index is None:
                 self.dimension = embeddings.shape[1]
-                self.index = faiss.IndexFlatIP(self.dimension)
+                self.index = self._create_index(embeddings)
+            elif self._mmapped:
+                # Mapped indexes are read-only; bring it into memory to grow it
+                self.index = faiss.read_index(str(self._index_file))
+                self._mmapped = False
 
             # Add embeddings
             self.index.add(embeddings)
+            if self._ivf_pending() and self.index.ntotal >= FAISS_IVF_MIN_VECTORS:
+                self.index = self._build_ivfpq_index()
 
             # Store document data
-            for chunk, embedding_result in zip(chunks, embedding_results):
-                doc_data = {
-                    "chunk": chunk,
-                    "embedding_result": embedding_result,
-                    "metadata": metadata,
-                    "added_at": datetime.now().isoformat(),
-                }
-                self.documents.append(doc_data)
+            self.chunks.extend(chunks)
+            self.metadata.extend([metadata] * len(chunks))
+            added_at = datetime.now(timezone.utc).isoformat()
+            self.added_at.extend([added_at] * len(chunks))
+
+            self._unsaved = True
+            if time.monotonic() - self._last_save >= FAISS_SAVE_INTERVAL:
+                self.save()
 
             return True
 
@@ -380,43 +832,189 @@ class FAISSVectorStore(VectorStore):
             print(f"Error adding documents to FAISS: {e}")
             return False
 
-    def similarity_search(self, query: str, k: int = 5, **kwargs) -> List[SearchResult]:
+    def _create_index(self, embeddings: np.ndarray):
+        """Create the configured FAISS index, training it on the first batch if needed."""
+        store_config = self.config.vector_store
+        index_type = store_config.faiss_index_type.lower()
+        quantizer = FAISS_SCALAR_QUANTIZERS.get(store_config.faiss_quantization.lower())
+        if quantizer is not None:
+            quantizer = getattr(faiss.ScalarQuantizer, quantizer)
+
+        if index_type == "hnsw":
+            if quantizer is not None:
+                index = faiss.IndexHNSWSQ(
+                    self.dimension,
+                    quantizer,
+                    store_config.faiss_hnsw_m,
+                    faiss.METRIC_INNER_PRODUCT,
+                )
+            else:
+                index = faiss.IndexHNSWFlat(
+                    self.dimension, store_config.faiss_hnsw_m, faiss.METRIC_INNER_PRODUCT
+                )
+            index.hnsw.efConstruction = store_config.faiss_ef_construction
+            index.hnsw.efSearch = store_config.faiss_ef_search
+        elif quantizer is not None and index_type != "ivfpq":
+            index = faiss.IndexScalarQuantizer(
+                self.dimension, quantizer, faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            # "ivfpq" also starts flat, until there is enough data to train
+            index = faiss.IndexFlatIP(self.dimension)
+
+        if not index.is_trained:
+            index.train(embeddings[:FAISS_TRAINING_SAMPLE_SIZE])
+
+        return index
+
+    def _ivf_pending(self) -> bool:
+        """Whether an "ivfpq" store is still on its initial flat index."""
+        return self.config.vector_store.faiss_index_type.lower() == "ivfpq" and (
+            isinstance(self.index, faiss.IndexFlat)
+        )
+
+    def _build_ivfpq_index(self):
+        """
+        Move the flat index's vectors into a trained IVF-PQ index.
+
+        Search then scans only `faiss_nprobe` of the inverted lists, over
+        vectors compressed to `faiss_pq_m` bytes, and re-ranks the best
+        candidates with 8-bit scalar codes.
+        """
+        store_config = self.config.vector_store
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        nlist = min(
+            FAISS_IVF_MAX_LISTS, int(4 * np.sqrt(len(vectors))), len(vectors) // 39
+        )
+
+        # PQ splits each vector into equal sub-vectors; other dimensions fall
+        # back to 8-bit scalar codes
+        if self.dimension % store_config.faiss_pq_m == 0:
+            codes = f"PQ{store_config.faiss_pq_m}x8"
+        else:
+            codes = "SQ8"
+        index = faiss.index_factory(
+            self.dimension,
+            f"IVF{nlist},{codes},Refine(SQ8)",
+            faiss.METRIC_INNER_PRODUCT,
+        )
+        index.train(vectors[: max(FAISS_TRAINING_SAMPLE_SIZE, 39 * nlist)])
+        index.add(vectors)
+        index.k_factor = FAISS_REFINE_K_FACTOR
+        faiss.extract_index_ivf(index).nprobe = store_config.faiss_nprobe
+        return index
+
+    def _search_params(self, k: int, **kwargs):
+        """Build per-query HNSW or IVF search parameters from the query kwargs."""
+        if isinstance(self.index, faiss.IndexRefine):
+            nprobe = kwargs.get("nprobe")
+            if nprobe is None and kwargs.get("recall_hint") == "high":
+                nprobe = 4 * self.config.vector_store.faiss_nprobe
+            if nprobe is None:
+                return None
+            return faiss.IndexRefineSearchParameters(
+                k_factor=FAISS_REFINE_K_FACTOR,
+                base_index_params=faiss.SearchParametersIVF(nprobe=nprobe),
+            )
+
+        if not isinstance(self.index, faiss.IndexHNSW):
+            return None
+
+        ef_search = kwargs.get("ef_search")
+        if ef_search is None and kwargs.get("recall_hint") == "high":
+            ef_search = 4 * self.config.vector_store.faiss_ef_search
+        if ef_search is None:
+            return None
+
+        return faiss.SearchParametersHNSW(efSearch=max(ef_search, k))
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        query_embedding: Optional[List[float]] = None,
+        min_score: float = 0.0,
+        **kwargs,
+    ) -> List[SearchResult]:
         """Perform similarity search in FAISS index."""
         if (
             not query
             or not query.strip()
             or self.index is None
-            or len(self.documents) == 0
+            or len(self.chunks) == 0
         ):
             return []
 
         try:
-            query_embedding = self.embedding_manager.generate_embedding(query.strip())
-            query_vector = np.array([query_embedding.embedding], dtype=np.float32)
+            query_embedding = self._embed_search_query(query, query_embedding)
+            query_vector = np.array([query_embedding], dtype=np.float32)
+            faiss.normalize_L2(query_vector)
 
-            k = min(k, len(self.documents))
-            scores, indices = self.index.search(query_vector, k)
+            k = min(k, len(self.chunks))
+            scores, indices = self.index.search(
+                query_vector, k, params=self._search_params(k, **kwargs)
+            )
 
-            search_results = []
-            for rank, (score, idx) in enumerate(zip(scores[0], indices[0])):
-                if idx < len(self.documents):
-                    doc_data = self.documents[idx]
-                    normalized_score = max(0.0, min(1.0, float(score)))
+            return self._build_results(scores[0], indices[0], min_score)
 
-                    search_result = SearchResult(
-                        chunk=doc_data["chunk"],
-                        score=normalized_score,
-                        rank=rank,
-                        metadata={"faiss_index": int(idx), "raw_score": float(score)},
-                    )
+        except Exception as e:
+            print(f"Error performing FAISS similarity search: {e}")
+            return []
 
-                    search_results.append(search_result)
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        query_embeddings: List[List[float]],
+        k: int = 5,
+        min_score: float = 0.0,
+        **kwargs,
+    ) -> List[List[SearchResult]]:
+        """Search all queries with one index.search call, spread over OpenMP threads."""
+        if not queries or self.index is None or len(self.chunks) == 0:
+            return [[] for _ in queries]
 
-            return search_results
+        try:
+            query_vectors = np.array(query_embeddings, dtype=np.float32)
+            faiss.normalize_L2(query_vectors)
+
+            k = min(k, len(self.chunks))
+            scores, indices = self.index.search(
+                query_vectors, k, params=self._search_params(k, **kwargs)
+            )
+            return [
+                self._build_results(row_scores, row_indices, min_score)
+                for row_scores, row_indices in zip(scores, indices)
+            ]
 
         except Exception as e:
-            print(f"Error performing FAISS similarity search: {e}")
-            return []
+            print(f"Error performing FAISS batch similarity search: {e}")
+            return [[] for _ in queries]
+
+    def _build_results(
+        self, scores: np.ndarray, indices: np.ndarray, min_score: float
+    ) -> List[SearchResult]:
+        """Wrap one query's FAISS hits, nearest first, in SearchResults."""
+        # FAISS pads rows with -1 when fewer than k vectors are reachable
+        keep = indices >= 0
+        clipped = np.clip(scores, 0.0, 1.0)
+        if min_score > 0.0:
+            keep &= clipped >= min_score
+
+        return [
+            SearchResult(
+                chunk=self.chunks[idx],
+                score=score,
+                rank=rank,
+                metadata={"faiss_index": idx, "raw_score": raw_score},
+            )
+            for rank, (idx, score, raw_score) in enumerate(
+                zip(
+                    indices[keep].tolist(),
+                    clipped[keep].tolist(),
+                    scores[keep].tolist(),
+                )
+            )
+        ]
 
     def delete_documents(self, document_ids: List[str]) -> bool:
         """FAISS doesn't support direct deletion."""
@@ -428,13 +1026,143 @@ class FAISSVectorStore(VectorStore):
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get FAISS index statistics."""
         return {
-            "document_count": len(self.documents),
+            "document_count": len(self.chunks),
             "index_dimension": self.dimension,
             "index_size": self.index.ntotal if self.index else 0,
+            "index_type": self.config.vector_store.faiss_index_type,
             "backend": "FAISS",
         }
 
 
+class InMemoryVectorStore(VectorStore):
+    """NumPy-based vector store keeping all embeddings in one contiguous matrix."""
+
+    def __init__(self, initial_capacity: int = 1024, config=None):
+        super().__init__(config)
+
+        self.initial_capacity = initial_capacity
+        self.embeddings: Optional[np.ndarray] = None  # (capacity, dimension)
+        self.size = 0
+        self.dimension = None
+
+        # Per-row payloads, parallel to the rows of self.embeddings
+        self.chunks: List[DocumentChunk] = []
+        self.source_documents: List[str] = []
+        self.metadata: List[Optional[DocumentMetadata]] = []
+
+    def _reserve(self, count: int) -> None:
+        """Ensure capacity for `count` more rows, doubling the matrix as needed."""
+        if self.embeddings is None:
+            capacity = max(self.initial_capacity, count)
+            self.embeddings = np.empty((capacity, self.dimension), dtype=np.float32)
+            return
+
+        capacity = self.embeddings.shape[0]
+        if self.size + count <= capacity:
+            return
+
+        while capacity < self.size + count:
+            capacity *= 2
+        grown = np.empty((capacity, self.dimension), dtype=np.float32)
+        grown[: self.size] = self.embeddings[: self.size]
+        self.embeddings = grown
+
+    def add_documents(
+        self, chunks: List[DocumentChunk], metadata: Optional[DocumentMetadata] = None
+    ) -> bool:
+        """Add document chunks to the in-memory matrix."""
+        if not chunks:
+            return True
+
+        try:
+            texts = [chunk.content for chunk in chunks]
+            vectors = self.embedding_manager.generate_embeddings_array(texts)
+
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+
+            self._reserve(len(vectors))
+            self.embeddings[self.size : self.size + len(vectors)] = vectors
+            self.size += len(vectors)
+
+            self.chunks.extend(chunks)
+            self.source_documents.extend(chunk.source_document for chunk in chunks)
+            self.metadata.extend([metadata] * len(chunks))
+
+            return True
+
+        except Exception as e:
+            print(f"Error adding documents to in-memory store: {e}")
+            return False
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        query_embedding: Optional[List[float]] = None,
+        min_score: float = 0.0,
+        **kwargs,
+    ) -> List[SearchResult]:
+        """Score all rows with a single matrix-vector product."""
+        if not query or not query.strip() or self.size == 0:
+            return []
+
+        try:
+            query_embedding = self._embed_search_query(query, query_embedding)
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+
+            scores = self.embeddings[: self.size] @ query_vector
+
+            k = min(k, self.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            if min_score > 0.0:
+                top = top[scores[top] >= min_score]
+
+            return [
+                SearchResult(
+                    chunk=self.chunks[idx],
+                    score=max(0.0, min(1.0, float(scores[idx]))),
+                    rank=rank,
+                    metadata={"row": int(idx), "raw_score": float(scores[idx])},
+                )
+                for rank, idx in enumerate(top)
+            ]
+
+        except Exception as e:
+            print(f"Error performing in-memory similarity search: {e}")
+            return []
+
+    def delete_documents(self, document_ids: List[str]) -> bool:
+        """Delete all chunks of the given source documents, compacting the matrix."""
+        if not document_ids or self.size == 0:
+            return True
+
+        ids = set(document_ids)
+        keep = np.fromiter(
+            (source not in ids for source in self.source_documents),
+            dtype=bool,
+            count=self.size,
+        )
+        kept = int(keep.sum())
+
+        self.embeddings[:kept] = self.embeddings[: self.size][keep]
+        self.chunks = [c for c, k in zip(self.chunks, keep) if k]
+        self.source_documents = [s for s, k in zip(self.source_documents, keep) if k]
+        self.metadata = [m for m, k in zip(self.metadata, keep) if k]
+        self.size = kept
+        return True
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        """Get in-memory store statistics."""
+        return {
+            "document_count": self.size,
+            "index_dimension": self.dimension,
+            "capacity": self.embeddings.shape[0] if self.embeddings is not None else 0,
+            "backend": "InMemory",
+        }
+
+
 class DocumentRetriever:
     """High-level document retrieval interface."""
 
@@ -443,18 +1171,46 @@ class DocumentRetriever:
         self.config = config or get_config()
 
     def retrieve_documents(
-        self, query: str, k: int = 5, min_score: float = 0.0
+        self,
+        query: str,
+        k: int = 5,
+        min_score: float = 0.0,
+        query_embedding: Optional[List[float]] = None,
+        **search_kwargs,
     ) -> List[SearchResult]:
         """Retrieve documents for the given query."""
         if not query or not query.strip():
             return []
 
-        results = self.vector_store.similarity_search(query, k=k)
-
-        # Apply score filtering
-        if min_score > 0.0:
-            results = [result for result in results if result.score >= min_score]
+        return self.vector_store.similarity_search(
+            query,
+            k=k,
+            query_embedding=query_embedding,
+            min_score=min_score,
+            **search_kwargs,
+        )
 
+    def retrieve_documents_batch(
+        self, queries: List[str], k: int = 5, min_score: float = 0.0
+    ) -> List[List[SearchResult]]:
+        """Retrieve documents for several queries, embedding and searching in bulk."""
+        positions = [i for i, query in enumerate(queries) if query and query.strip()]
+        results: List[List[SearchResult]] = [[] for _ in queries]
+        if not positions:
+            return results
+
+        texts = [queries[i].strip() for i in positions]
+        embeddings = self.vector_store.embedding_manager.generate_query_embeddings(
+            texts
+        )
+        found = self.vector_store.similarity_search_batch(
+            texts,
+            [embedding.embedding for embedding in embeddings],
+            k=k,
+            min_score=min_score,
+        )
+        for i, hits in zip(positions, found):
+            results[i] = hits
         return results
 
     def add_documents_from_processor(self, processing_result: Dict[str, Any]) -> bool:
@@ -484,6 +1240,8 @@ def create_vector_store(config=None, **kwargs) -> VectorStore:
         return ChromaVectorStore(config=config, **kwargs)
     elif store_type.lower() == "faiss":
         return FAISSVectorStore(config=config, **kwargs)
+    elif store_type.lower() == "memory":
+        return InMemoryVectorStore(config=config, **kwargs)
     else:
         raise ValueError(f"Unsupported vector store type: {store_type}")
 